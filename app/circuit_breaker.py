@@ -0,0 +1,99 @@
+"""
+Module containing a circuit breaker for calls to unreliable gameservers.
+
+A breaker opens after `threshold` consecutive failures, after which calls are
+refused without being made. Once its backoff has passed a single probe call is
+allowed through (half-open); success closes the breaker, failure reopens it
+with a doubled backoff.
+
+Authors: Emmett Peck (EmmettPeck)
+Version: October 18th, 2026
+"""
+
+import logging
+import time
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is refused by an open circuit breaker"""
+    pass
+
+
+class CircuitBreaker:
+    """
+    A per-server circuit breaker.
+
+    Attributes
+    ---
+    `name` : `str`
+        -- Name of the guarded server, used in logging
+    `state` : `str`
+        -- One of CLOSED, OPEN, HALF_OPEN
+    `failures` : `int`
+        -- Consecutive failed calls
+    `backoff` : `float`
+        -- Seconds until the next probe while open
+    """
+    CLOSED = "Closed"
+    OPEN = "Open"
+    HALF_OPEN = "Half-Open"
+
+    def __init__(self, name:str, threshold:int, backoff_min:float,
+        backoff_max:float):
+        self.name = name
+        self.threshold = threshold
+        self.backoff_min = backoff_min
+        self.backoff_max = backoff_max
+        self.state = self.CLOSED
+        self.failures = 0
+        self.backoff = backoff_min
+        self.probe_at = 0
+
+    def is_closed(self) -> bool:
+        return self.state == self.CLOSED
+
+    def allow(self) -> bool:
+        """
+        Returns: True if a call may be made now
+
+        While open, the first call after the backoff is let through as a probe.
+        """
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and time.monotonic() >= self.probe_at:
+            logging.info(f"{self.name} circuit half-open, probing")
+            self.state = self.HALF_OPEN
+            return True
+        return False
+
+    def record_success(self):
+        if self.state != self.CLOSED:
+            logging.warning(f"{self.name} circuit closed")
+        self.state = self.CLOSED
+        self.failures = 0
+        self.backoff = self.backoff_min
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN:
+            # Failed probe, wait longer before the next one
+            self.backoff = min(self.backoff*2, self.backoff_max)
+            self.open()
+        elif self.state == self.CLOSED and self.failures >= self.threshold:
+            self.open()
+
+    def cancel_probe(self):
+        """
+        Reopens a half-open breaker whose probe was cancelled, so the next
+        call probes again rather than every call being refused.
+        """
+        if self.state == self.HALF_OPEN:
+            logging.info(f"{self.name} circuit probe cancelled")
+            self.state = self.OPEN
+            self.probe_at = time.monotonic()
+
+    def open(self):
+        logging.warning(f"{self.name} circuit open after {self.failures} "
+            f"failures, probing in {self.backoff}s")
+        self.state = self.OPEN
+        self.probe_at = time.monotonic() + self.backoff
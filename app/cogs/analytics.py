@@ -8,13 +8,16 @@ Authors: Emmett Peck (EmmettPeck)
 Version: May 27th, 2022
 """
 
-from datetime import timedelta
+from datetime import datetime, timedelta
 import logging
 
 from discord.ext import commands
 
 import analytics_lib
+from database import DB
+from docker_events import ContainerEvents, describe_status
 from embedding import embed_build, embed_playtime
+from executor import Executor
 
 class Analytics(commands.Cog):
 
@@ -62,7 +65,7 @@ class Analytics(commands.Cog):
 
         # TODO If server not provided, print total w/ list of top servers
         if server == None:
-            total = analytics_lib.handle_playtime(
+            total = await Executor.run('http', analytics_lib.handle_playtime,
                 bot=self.bot,
                 server_name=server, 
                 request=name)
@@ -77,7 +80,7 @@ class Analytics(commands.Cog):
         # Look for server. found? print total: prompt user of input error. -----
         else: 
             # Get Playtime From Server
-            single = analytics_lib.handle_playtime(
+            single = await Executor.run('http', analytics_lib.handle_playtime,
                 bot=self.bot, 
                 request=name,
                 server_name=server)
@@ -116,6 +119,51 @@ class Analytics(commands.Cog):
             else:
                 logging.ERROR(f"ERROR: Other false evaluating condition in analytics single == {single}")
 
+    @commands.command(
+        name='uptime',
+        help='''Returns a server's status & uptime.
+            >uptime <server-name>, otherwise the server linked to the channel.''',
+        brief='Get server uptime.')
+    async def uptime(self, ctx, server:str=None):
+        """
+        Prints how long a server has been up or down, and the share of the
+        last DB.get_uptime_window() days it was up, to channel
+
+        Parameter server: Name or docker name of the server, the server linked
+        to ctx if None
+        """
+        container = None
+        for entry in DB.get_containers():
+            if (server in (entry.get('name'), entry.get('docker_name'))
+                or (server is None and entry.get('channel_id') == ctx.channel.id)):
+                container = entry
+                break
+        if container is None:
+            await ctx.send(
+                "Please provide a server, >uptime <server-name>, or use the "
+                "command in a linked channel.")
+            return
+
+        docker_name = container.get('docker_name')
+        log = await Executor.run('disk', ContainerEvents.get_log, docker_name)
+        current = log.get_current()
+        if current is None:
+            await ctx.send(embed=embed_build(reference=ctx.author,
+                message=f"No uptime recorded for `{container.get('name')}` yet."))
+            return
+
+        status = ContainerEvents.get_status(docker_name)
+        if status is None:
+            status = "Online" if log.is_open() else "Offline"
+        else:
+            status = describe_status(status)
+        window = timedelta(days=DB.get_uptime_window())
+        share = log.get_uptime(datetime.now() - window) / window
+        await ctx.send(embed=embed_build(reference=ctx.author,
+            message=f"{container.get('name')} has been {status} for "
+                f"`{analytics_lib.td_format(current)}`, up {share:.1%} of the "
+                f"last {window.days} days."))
+
 def setup(bot):
     """
     Setup conditon for discord.py cog
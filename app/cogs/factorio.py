@@ -3,55 +3,124 @@ factorio.py
 By: Emmett Peck
 A cog for discord.py that incorporates docker chatlink, header updating, and playtime logging.
 """
-import discord
-from discord.ext import tasks, commands
+import logging
+from discord.ext import commands
+from discord.ext.commands import has_permissions, CheckFailure
 
 from cogs.gamecog import GameCog
 from server import Server
-from messages import split_first, MessageType, get_msg_dict
+from messages import COLORS, split_first, MessageType
+from circuit_breaker import CircuitOpenError
+from embedding import embed_build
+from rcon import RconError
 
 class Factorio(GameCog):
 
+# COMMANDS ---------------------------------------------------------------------
+    # Send ---------------------------------------------------------------------
+    @commands.command(name='fsendcmd', help="Usage: >fsendcmd <arg>. Requires administrator permissions.", brief="Sends command to Factorio server.")
+    @has_permissions(administrator=True)
+    async def fsendcmd(self, ctx, *, mess):
+        ''' Sends /<args> to the linked Factorio server over rcon'''
+        index = self.find_server(ctx.channel.id)
+        if index is None:
+            await ctx.send("Server not found. Use command only in 'Factorio' text channels.")
+            return
+        server = self.servers[index]
+        if server.rcon is None:
+            await ctx.send(f"{server.server_name} has no rcon configured.")
+            return
+        logging.critical(f"{ctx.author} fsendcmd {mess} to {server.server_name}")
+        try:
+            response = await self.call(server, 'rcon', self.send_command, server, f"/{mess}")
+        except (CircuitOpenError, RconError):
+            await ctx.send(f"{server.server_name} is unreachable, try again later.")
+            return
+        await ctx.send(embed=embed_build(message=response if response else "Sent.",
+            reference=ctx.author))
+
+    @fsendcmd.error
+    async def fsendcmd_error(self, error, ctx):
+        if isinstance(error, CheckFailure):
+            await self.bot.send_message(ctx.message.channel, "You do not have the necessary permissions.")
+
     # OVERLOADS ---------------------------------------------------------------------------
     def get_version(self) -> str:
         return "Factorio"
 
-    def filter(self, server:Server, message:str, ignore=False):
+    def can_send_message(self, server:Server) -> bool:
+        """OVERLOAD: Factorio, chat is sent over rcon"""
+        return server.rcon is not None
+
+    async def send_command(self, server:Server, command:str) -> str:
+        """
+        Returns: Response of server to command sent over its rcon connection
+
+        Raises RconError if the server has no rcon configured or can't be reached.
+        """
+        if server.rcon is None:
+            raise RconError(f"{server.server_name} has no rcon configured")
+        return await server.rcon.command(command)
+
+    async def send_message(self, server:Server, message:str):
+        """
+        OVERLOAD: Factorio
+        Sends message to Factorio chat, where it shows from <server>
+        """
+        await self.send_command(server, message.replace('\n', ' '))
+
+    async def get_player_list(self, server:Server) -> list:
+        """
+        OVERLOAD: Factorio
+        Returns: ["Playername", ...] from /players online, None without rcon
+        """
+        if server.rcon is None:
+            return None
+        # Online players (2):\n  Emmett (online)\n  Pine (online)
+        response = await self.send_command(server, "/players online")
+        return [line.strip().rsplit(' (online)', 1)[0]
+            for line in response.splitlines()[1:] if line.strip()]
+
+    async def get_header(self, server:Server) -> str:
+        """
+        OVERLOAD: Factorio
+        Refreshes online players from rcon before rendering the header, so
+        joins & leaves missed while offline are corrected
+        """
+        if server.rcon is not None:
+            try:
+                players = await self.call(server, 'rcon', self.get_player_list, server)
+            except Exception as e:
+                logging.warning(f"{server.server_name} players online failed: {e}")
+            else:
+                server.online_players = players if players else []
+        return await super().get_header(server)
+
+    @staticmethod
+    def parse(message:str, version:str=None) -> tuple:
         """
         OVERLOAD: Factorio:Latest
-        Filters logs by version, adding leaves/joins to connectqueue and messages to message queue
-        """
-        if server.fingerprint.is_unique_fingerprint(message):
-            post = None
-            time = split_first(message,'[')[0].strip()
-            in_brackets = split_first(split_first(message,'[')[1],']')[0]
-            after_brackets = split_first(message,']')[1]
-            
-            # Message
-            if in_brackets == "CHAT":
-                type = MessageType.MSG
-                name = split_first(after_brackets,':')[0].strip()
-                msg = split_first(after_brackets,':')[1]
-                post =  get_msg_dict(f'<{name}>', msg, type, discord.Color.dark_gold())
-            # Join
-            elif in_brackets == "JOIN":
-                type = MessageType.JOIN
-                msg = 'joined the game.'
-                name = after_brackets.strip().split(' ',1)[0] # First Word
-                post =  get_msg_dict(name, msg, type, discord.Color.dark_gold())
-            # Leave
-            elif in_brackets == "LEAVE":
-                type = MessageType.LEAVE
-                msg = 'left the game.'
-                name = after_brackets.strip().split(' ',1)[0]
-                post =  get_msg_dict(name, msg, type, discord.Color.dark_gold())
-
-            # If Not Ignore, Messages are sent and accounted for playtime
-            if post and (not ignore):
-                if post.get('type') == MessageType.JOIN or post.get('type') == MessageType.LEAVE:
-                    post["server"] = server.server_name
-                    server.connect_queue.put(post)
-                server.message_queue.put(post)
+        Parses log line by version into (username, message, MessageType, discord.Color), None if not an event
+        """
+        in_brackets = split_first(split_first(message,'[')[1],']')[0]
+        after_brackets = split_first(message,']')[1]
+        
+        # Message
+        if in_brackets == "CHAT":
+            name = split_first(after_brackets,':')[0].strip()
+            msg = split_first(after_brackets,':')[1]
+            if name == "<server>": # Our own relayed messages
+                return None
+            return (f'<{name}>', msg, MessageType.MSG, COLORS['dark_gold'])
+        # Join
+        elif in_brackets == "JOIN":
+            name = after_brackets.strip().split(' ',1)[0] # First Word
+            return (name, 'joined the game.', MessageType.JOIN, COLORS['dark_gold'])
+        # Leave
+        elif in_brackets == "LEAVE":
+            name = after_brackets.strip().split(' ',1)[0]
+            return (name, 'left the game.', MessageType.LEAVE, COLORS['dark_gold'])
+        return None
 
 def setup(bot):
     bot.add_cog(Factorio(bot))
\ No newline at end of file
@@ -15,19 +15,36 @@ Version: May 27th, 2022
 """
 
 import asyncio
+from datetime import datetime
+import inspect
+import itertools
 import json
 import os
 import queue
 import logging
 
-from discord.ext import commands, tasks
+from discord.ext import commands
 import discord
 
 import analytics_lib
 from database import DB
-from embedding import embed_message
-from messages import MessageType, get_msg_dict, split_first
+from docker_events import ContainerEvents, describe_status
+from circuit_breaker import CircuitOpenError
+from embedding import embed_message, pack_lines, pack_text
+from executor import Executor
+from ingest_worker import IngestWorkers
+from log_sources import drain_queue, nanos_to_datetime
+from messages import COLORS, Event, MessageType, split_first
+from outbox import RateBucket
 from server import Server
+from webhooks import Webhook, WebhookError, Webhooks
+
+# discord.py 2.0+ sends up to 10 embeds per message
+SEND_EMBEDS = 'embeds' in inspect.signature(discord.abc.Messageable.send).parameters
+# Events taken from an outbox per send, a message's worth
+RELAY_BATCH = 10
+# Name of the webhooks Pinebot manages for webhook relay
+WEBHOOK_NAME = "Pinebot"
 
 
 class GameCog(commands.Cog):
@@ -47,6 +64,7 @@ class GameCog(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
+        self.chat_unconfigured = set() # Names of servers warned can't chat
         self.servers = self.load_servers()
                 # Update Online List 
                     # TODO: Check if online players most recent is join, 
@@ -54,21 +72,23 @@ class GameCog(commands.Cog):
                     # include addplayer for unrecognized players
                         # TODO break out addplayer function
 
-        # Ensure fingerprinted messages before cog was online
+        # Start per-server ingestion, each server bootstraps concurrently in
+        # its own task so the cog is usable before slow servers are loaded
         for server in self.servers:
-            self.read(server, ignore=True)
-        
-        # Start Scheduled tasks
-        self.pass_message.start()
+            self.start_ingestion(server)
 
     @commands.Cog.listener()
     async def on_ready(self):
-        # Update Headers On Launch
+        # Update Headers On Launch, unready servers update once bootstrapped
         for server in self.servers:
-            await self.header_update(server=server)
+            if server.ready:
+                self.header_update(server=server)
 
     def cog_unload(self):
-        self.pass_message.cancel()
+        for server in self.servers:
+            self.close_server(server)
+        IngestWorkers.flush()
+        self.bot.loop.create_task(Webhooks.close())
 
     # To Be Overloaded: --------------------------------------------------------
 
@@ -143,6 +163,44 @@ class GameCog(commands.Cog):
 
         logging.warning(f"{message} GameCog send_message not implemented.")
 
+    def can_send_message(self, server:Server) -> bool:
+        """
+        Returns: True if server is configured to receive chat through
+        send_message(). Unconfigured servers are not relayed to at all, so
+        a configuration gap is not counted as failures by the breaker.
+
+        To be overloaded by GameCog children.
+        """
+        return True
+
+    def get_chat_command(self, message:str) -> str:
+        """
+        Returns: Console command send_message() sends message with, None if
+        the game can't show several messages in one command.
+
+        To be overloaded by GameCog children. Lets relay_chat() combine
+        messages, joined by newlines, into commands of up to get_chat_limit()
+        bytes.
+        """
+        return None
+
+    def get_chat_limit(self) -> int:
+        """
+        Returns: Max bytes of a get_chat_command() command
+
+        To be overloaded by GameCog children.
+        """
+        return 1400
+
+    def get_avatar_url(self, username:str) -> str:
+        """
+        Returns: URL of username's avatar for webhook relay, None to use the
+        webhook's own.
+
+        To be overloaded by GameCog children.
+        """
+        return None
+
     def discord_message_format(self, server:Server, message:str) -> str:
         """
         Formats message based on version and logs to console.
@@ -160,12 +218,88 @@ class GameCog(commands.Cog):
         logging.critical(f'{server.server_name}.{server.cog_name}: "{item}"')
         return item
 
-    def filter(self, server:Server, message:str, ignore:bool):
+    @staticmethod
+    def parse(message:str, version:str=None) -> tuple:
         """
-        Filters logs using versionbased conditions by type and content. 
-        Adds leaves/joins to connectqueue and messages to message queue.
-        
-        To be overloaded by GameCog Children
+        Returns: `(username, message, MessageType, discord.Color)` parsed from
+        a log line using versionbased conditions, None if not an event. A death
+        may append its cause, ie. "was slain by", kept as Event.cause.
+
+        To be overloaded by GameCog Children. Static, so it can also be run
+        by an ingestion worker process (see ingest_worker.py).
+
+        Parameters:
+        ---
+        `message` : `str`
+            -- Log line to parse
+        `version` : `str`
+            -- Version of the server the line is from, ie. "Minecraft:1.19"
+        """
+        return ("__default__", message, MessageType.MSG, COLORS['blue'])
+
+    @staticmethod
+    def get_prefix(version:str=None) -> str:
+        """
+        Returns: substring every event line of version contains, None if any
+        line may be an event. Lines without it are dropped by parse_batch()
+        before being fingerprinted or parsed.
+
+        To be overloaded by GameCog Children.
+        """
+        return None
+
+    @classmethod
+    def parse_batch(cls, lines:list, version:str, fingerprint) -> list:
+        """
+        Returns: list of `(nanos, username, message, MessageType, discord.Color)`
+        events parsed from the unique lines of a block, in order. Deaths parsed
+        with a cause have it appended, see parse().
+
+        Classmethod, so it can also be run by an ingestion worker process.
+
+        Parameters:
+        ---
+        `lines` : `list`
+            -- `(nanos, line)` tuples to parse
+        `version` : `str`
+            -- Version of the server the lines are from
+        `fingerprint` : `FingerPrints`
+            -- Window to dedup the lines against
+        """
+        prefix = cls.get_prefix(version)
+        parse = cls.parse
+        is_unique = fingerprint.is_unique_fingerprint
+        events = []
+        for nanos, line in lines:
+            if prefix is not None and prefix not in line:
+                continue
+            if not is_unique(line):
+                continue
+            parsed = parse(line, version)
+            if parsed:
+                events.append((nanos, *parsed))
+        return events
+
+    def filter_batch(self, server:Server, lines:list) -> list:
+        """
+        Prefilters, fingerprints and parses a block of lines read at once.
+        Returns: list of `(nanos, username, message, MessageType, discord.Color)`
+        events, see parse_batch()
+
+        Parameters:
+        ---
+        `server` : `Server`
+            -- Server the lines are from, storing their fingerprints
+        `lines` : `list`
+            -- `(nanos, line)` tuples to parse
+        """
+        return self.parse_batch(lines, server.version, server.fingerprint)
+
+    def filter(self, server:Server, message:str, ignore:bool, 
+        timestamp:datetime=None):
+        """
+        Filters logs using parse(), fingerprinting out already seen lines.
+        Adds leaves/joins to connectqueue and messages to outbox.
 
         Parameters:
         ---
@@ -175,62 +309,123 @@ class GameCog(commands.Cog):
             -- Message string to filter using conditions
         `ignore` : `Bool`
             -- Whether or not to put events to queues
+        `timestamp` : `datetime`
+            -- Time the line was logged, defaults to now
         """
         # Fingerprints message, only uniques get sent
         if not server.fingerprint.is_unique_fingerprint(message): return
 
-        # Filter message into a dictionary
-        dict = get_msg_dict(username="__default__",
-            message=message,
-            MessageType=MessageType.MSG,
-            color=discord.Color.blue())
+        # Filter message into an event
+        parsed = self.parse(message, server.version)
 
         # If Not Ignore, Messages are sent and accounted for playtime
-        if dict and (not ignore):
-            mtype =dict.get('type')
-            if mtype == MessageType.JOIN or mtype == MessageType.LEAVE:
-                dict["server"] = server.server_name
-                server.connect_queue.put(dict)
-            server.message_queue.put(dict)
+        if parsed and (not ignore):
+            username, message, mtype, color, *cause = parsed
+            self.route(server, Event(username, message, mtype, color,
+                time=timestamp, cause=cause[0] if cause else None))
+
+    def route(self, server:Server, event:Event):
+        """
+        Puts an event to server's queues; leaves/joins to connect_queue, and
+        all to outbox.
+        """
+        if event.is_connect():
+            event.server = server.server_name
+            server.connect_queue.put(event)
+        server.outbox.put(event)
             
 #---------------------------- Headers ------------------------------------------
-    async def header_update(self,server:Server):
+    def header_update(self, server:Server):
         """
-        Updates header with server playercount & docker status
+        Requests an update of server's linked channel header, starting its
+        HeaderManager if not running. Requests are coalesced into edits within
+        discord's topic rate limit, see headers.py.
 
         Parameters:
         ---
         `server` : `Server`
             -- Server object to update the linked channel header for
         """
+        if not server.header.is_running():
+            server.header.start(
+                render=lambda: self.get_header(server),
+                apply=lambda topic: self.set_header(server, topic))
+        server.header.request()
+
+    async def set_header(self, server:Server, topic:str) -> bool:
+        """
+        Returns: True if server's linked channel header was edited to topic
 
-        if (DB.client.containers.get
-        (server.server.get("docker_name")).status.title().strip() == 'Running'):
-            status = "Online"
+        The channel is looked up on every edit, as it is unknown until the bot
+        is ready; on_ready requests the update again. A channel whose cached
+        topic already matches is not edited.
+        """
+        ctx = self.bot.get_channel(server.cid)
+        if ctx is None:
+            logging.info(f"{server.server_name} channel unavailable, "
+                "header update skipped")
+            return False
+        if ctx.topic == topic:
+            return False
+        await ctx.edit(topic=topic)
+        return True
+
+    async def get_header(self, server:Server) -> str:
+        """
+        Returns: header of server with playercount & docker status
+
+        The status is looked up from the docker events subscriber, asking
+        docker only for a container it has not seen yet. "Unreachable" while
+        server's circuit breaker is not closed.
+
+        Parameters:
+        ---
+        `server` : `Server`
+            -- Server object to render the linked channel header of
+        """
+        status = ContainerEvents.get_status(server.docker_name)
+        if not server.breaker.is_closed():
+            status = "Unreachable"
+        elif status is not None:
+            status = describe_status(status)
         else:
-            status = "Offline"
-        await self.update_channel_header(server=server, container_status=status)
+            try:
+                status = await self.call(server, 'docker', 
+                    self.get_container_status, server)
+            except Exception as e:
+                logging.warning(f"{server.server_name} status unavailable: {e}")
+                status = "Unreachable"
+        return self.get_channel_header(server=server, container_status=status)
+
+    def get_container_status(self, server:Server) -> str:
+        """
+        Returns: "Online" if server's container is running, otherwise "Offline"
+
+        Blocking docker call, await through Executor from coroutines.
+        """
+        def reload_status(container):
+            container.reload()
+            return container.status
+
+        return describe_status(server.use_container(reload_status))
     
-    async def update_channel_header(self, server:Server, container_status:str):
+    def get_channel_header(self, server:Server, container_status:str) -> str:
         """
-        Uses implemented formatting to update linked channel heading.
+        Returns: linked channel heading in implemented formatting.
 
         Contains formatting for channel_header, overload this to change.
 
         Parameters:
         ---
         `server` : `Server`
-            -- Server object to update the linked channel header for
+            -- Server object to format the linked channel header of
         `container_status` : `str`
             -- current container status
         """
-        ctx = self.bot.get_channel(server.cid)
-        await ctx.edit(
-            topic=f"{server.server_name} | {server.version} | "
-                f"{len(server.online_players)}/"
-                f"{server.player_max if server.player_max > -1 else 'ꝏ'}"
-                f" | Status: {container_status}")
-        logging.info(f"Updated Header {server.server_name}.{server.cog_name}")
+        return (f"{server.server_name} | {server.version} | "
+            f"{len(server.online_players)}/"
+            f"{server.player_max if server.player_max > -1 else 'ꝏ'}"
+            f" | Status: {container_status}")
 
 #==========================Structural Methods===================================
 #   Contains filesystem add/load/create, setters/getters, and search methods
@@ -463,18 +658,94 @@ class GameCog(commands.Cog):
         for container in DB.get_containers():
             cog_name = split_first(container.get('version'),':')[0]
             if cog_name == cog_version:
-                # Create Server Object
-                server=Server(server=container, bot=bot, cog_name=cog_name,
-                    statistics=self.load_statistics(cog_name=cog_name,server_name=container.get('name')))
-
-                # Get Online PlayerList
-                pl = self.get_player_list(server)
-                server.online_players = pl if pl else []
-                
-                server_list.append(server)
-                logging.critical(f"loaded {server.server_name} with {len(server.online_players)}/{server.player_max} players.")
+                server_list.append(self.load_server(
+                    container=container, bot=bot, cog_name=cog_name))
         return server_list
 
+    def load_server(self, container:dict, bot=None, cog_name:str=None) -> Server:
+        """
+        Returns: Server object loaded from containers.json dictionary
+
+        Parameters:
+        ---
+        `container` : `dict`
+            -- containers.json entry of the server
+        `bot` : `discord.bot`
+            -- The current discord bot instance
+        `cog_name` : `str`:
+            -- The name of the GameCog the server belongs to
+        """
+        bot = self.bot if bot == None else bot
+        cog_name = self.get_version() if cog_name == None else cog_name
+
+        # Create Server Object, statistics & players are loaded by bootstrap()
+        server=Server(server=container, bot=bot, cog_name=cog_name,
+            statistics=[])
+        return server
+
+    async def bootstrap(self, server:Server):
+        """
+        Loads server's statistics & online players off the event loop.
+
+        Statistics are retried until loaded, as ingesting connect events 
+        without them would overwrite player files. The player list is given 
+        up on after its rcon timeout, leaving the server with no online 
+        players.
+
+        Parameters:
+        ---
+        `server` : `Server`
+            -- Server to load
+        """
+        while True:
+            try:
+                server.statistics = await Executor.run('disk', 
+                    self.load_statistics, cog_name=server.cog_name,
+                    server_name=server.server_name)
+                break
+            except asyncio.TimeoutError:
+                logging.error(f"{server.server_name} load_statistics timed out, retrying")
+
+        # Get Online PlayerList
+        try:
+            pl = await self.call(server, 'rcon', self.get_player_list, server)
+        except Exception as e:
+            logging.error(f"{server.server_name} get_player_list failed: {e}")
+            pl = None
+        server.online_players = pl if pl else []
+
+        server.ready = True
+        logging.critical(f"loaded {server.server_name} with {len(server.online_players)}/{server.player_max} players.")
+        if self.bot.is_ready():
+            self.header_update(server=server)
+
+    def add_server(self, container:dict):
+        """
+        Loads a newly registered containers.json entry and starts ingesting it
+
+        Parameters:
+        ---
+        `container` : `dict`
+            -- containers.json entry of the server
+        """
+        server = self.load_server(container=container)
+        self.servers.append(server)
+        self.start_ingestion(server)
+
+    def remove_server(self, cid:int):
+        """
+        Closes and removes the server linked to channel cid
+
+        Parameters:
+        ---
+        `cid` : `int`
+            -- Server discord channel id
+        """
+        index = self.find_server(cid=cid)
+        if index == None:
+            return
+        self.close_server(self.servers.pop(index))
+
     def load_statistics(self, cog_name:str, server_name:str) -> list:
         """
         Returns: list of files in data/servers/{cog_name}/{docker_name} loaded
@@ -657,27 +928,57 @@ class GameCog(commands.Cog):
 #============================Core Methods=======================================
 # Contains scheduled tasks, boilerplate read/send, queue handling
 
-    def read(self, server:Server, ignore=False):
+    def locked_read(self, server:Server) -> int:
+        """
+        read() holding server's read_lock, so a read left running past its
+        timeout never overlaps the next. Returns: 0 if another read holds it
+        """
+        if not server.read_lock.acquire(blocking=False):
+            return 0
+        try:
+            return self.read(server)
+        finally:
+            server.read_lock.release()
+
+    def read(self, server:Server, ignore=False) -> int:
         """
-        Tails docker logs of server, sending output to filter().
-        (Tail length defined in database.py)
+        Drains lines buffered by the server's log source to filter_batch(),
+        routes the events, then commits the position past them.
+        Returns: Number of lines read
 
         Parameters:
         ---
         `server` : `Server`
-            -- The server to tail logs of
+            -- The server to read new lines of
 
         `ignore` : `bool`
             -- Whether to print, log, and act on events
         """
-        # Filters, then reads set_tail_len of logs to an iterable
-        container = DB.client.containers.get(server.docker_name)
-        response = container.logs(tail=DB.get_tail_len()).decode(
-            encoding="utf-8", 
-            errors="ignore")
-                
-        for msg in response.strip().split('\n'):
-            self.filter(message=msg, server=server,ignore=ignore)
+        lines = server.log_source.drain()
+        if not lines:
+            return 0
+
+        block = [(nanos, msg) for nanos, position, msg in lines]
+        if IngestWorkers.enabled():
+            # Parse in a worker process, which returns compact events
+            events = [(nanos, username, message, MessageType(mtype), color,
+                *cause)
+                for nanos, username, message, mtype, color, *cause
+                in IngestWorkers.parse(docker_name=server.docker_name,
+                    parser=type(self).parse_batch,
+                    version=server.version,
+                    lines=block)]
+        else:
+            events = self.filter_batch(server, block)
+
+        if not ignore:
+            for nanos, username, message, mtype, color, *cause in events:
+                self.route(server, Event(username, message, mtype, color,
+                    nanos_to_datetime(nanos), cause=cause[0] if cause else None))
+
+        nanos, position, msg = lines[-1]
+        server.log_source.commit(nanos, position)
+        return len(lines)
 
     def send(self, server:Server, command:str, log:bool=False, filter=True) -> str: 
         """
@@ -691,15 +992,13 @@ class GameCog(commands.Cog):
         
         Parameter logging: Bool to log command sent, and response
         """
-        # Attach Container
-        container = DB.client.containers.get(server.docker_name)
-
         # Single-Quote Filtering (Catches issue #9)
         if filter:
             command = command.replace("'", "'\\''") 
         
-        # Send Command, and decipher tuple
-        resp_bytes = container.exec_run(command)
+        # Send Command using cached container, and decipher tuple
+        resp_bytes = server.use_container(
+            lambda container: container.exec_run(command))
         resp_str = resp_bytes[1].decode(encoding="utf-8", errors="ignore")
         logging.info(f"Sent {command} to {server.server_name}: {resp_str}")
 
@@ -709,6 +1008,44 @@ class GameCog(commands.Cog):
             logging.critical(f"Response: {resp_str}")
         return resp_str
 
+    async def call(self, server:Server, call_type:str, func, *args, **kwargs):
+        """
+        Returns: result of blocking func run through Executor, guarded by 
+        server's circuit breaker.
+
+        Raises CircuitOpenError without calling func while the breaker is open.
+        Failures (including timeouts) are recorded and re-raised, cancelled
+        calls are not recorded. Headers are updated when the breaker changes
+        state.
+
+        Parameters:
+        ---
+        `server` : `Server`
+            -- Server the call is made to
+        `call_type` : `str`
+            -- Executor call type, ie. 'docker' or 'rcon'
+        `func` : `callable`
+            -- Blocking function or coroutine function to call
+        """
+        state = server.breaker.state
+        if not server.breaker.allow():
+            raise CircuitOpenError(f"{server.server_name} circuit is open")
+        try:
+            result = await Executor.run(call_type, func, *args, **kwargs)
+        except asyncio.CancelledError:
+            # Not an outcome, but a cancelled probe must not stay half-open
+            server.breaker.cancel_probe()
+            raise
+        except Exception:
+            server.breaker.record_failure()
+            raise
+        else:
+            server.breaker.record_success()
+            return result
+        finally:
+            if server.breaker.state != state:
+                self.header_update(server=server)
+
 #------------------------- Queue Handlers --------------------------------------
     async def handle_connect_queue(self, server:Server):
         """
@@ -716,7 +1053,10 @@ class GameCog(commands.Cog):
 
         Adds modifications to playtime as appropriate
         Updates Header after a connect event
-        Saves statistics after modifications
+        Saves statistics after modifications, even if digesting fails
+
+        An event whose player lookup times out is put back at the front of the
+        queue with the events after it, to be digested in order next pass.
 
         Parameter server: The server to reference for a connect_queue
         """
@@ -725,33 +1065,27 @@ class GameCog(commands.Cog):
         # Digest Events
         try:
             while True:
-                x = server.connect_queue.get_nowait()
+                try:
+                    x = server.connect_queue.get_nowait()
+                except queue.Empty:
+                    break
                 
                 # Event Type (Join/Leave)
-                temp = x.get('type')
-                if temp == None: 
-                    logging.error(f"connect_queue type None from {x}, skipping dictionary")
-                    continue
-                join = True if temp == MessageType.JOIN else False
+                join = x.type is MessageType.JOIN
                 
                 # Find Player Index
-                user = x.get('username')
-                uuid = self.get_uuid(user)
-                logging.info(f'connect_queue user={user}, uuid={uuid}, join={join}')
-
-                # Get index of player -- adding player if not present
-                player_index = self.find_player(server=server, username=user, uuid=uuid)
-                logging.info(f'handle_connect_queue playerindex={player_index}')
+                user = x.username
+                try:
+                    uuid, player_index = await self.lookup_player(server, user)
+                except asyncio.TimeoutError:
+                    logging.warning(f"{server.server_name} player lookup of "
+                        f"{user} timed out, retrying next pass")
+                    for event in [x] + drain_queue(server.connect_queue):
+                        server.connect_queue.put(event)
+                    break
                 if player_index == None:
-                    logging.info(f'handle_connect_queue creating user')
-                    self.create_statistics(server=server, username=user, uuid=uuid)
-
-                    # Get new player_index
-                    player_index = self.find_player(server=server, username=user, uuid=uuid)
-                    logging.info(f'handle_connect_queue new playerindex is {player_index}')
-                    if player_index == None:
-                        logging.critical(f'New playerindex is {player_index}, skipping entry, filesystem likely compromised.')
-                        continue
+                    logging.critical(f'New playerindex is {player_index}, skipping entry, filesystem likely compromised.')
+                    continue
                 
                 # Add Connect Events w/ fixing logic
                 recentest_is_join = analytics_lib.is_recentest_join(statistics=server.statistics[player_index])
@@ -764,14 +1098,14 @@ class GameCog(commands.Cog):
                         server.statistics[player_index]['joins'].pop()
                     logging.info(f'handle_connect_queue: adding {user} join')
                     server.statistics[player_index]['joins'].append(
-                        str(x.get('time')))
+                        str(x.time))
 
                 # If adding Leave and the most recent entry is a leave, ignore adding leave
                 elif join == False: 
                     if recentest_is_join == True:
                         logging.info(f'handle_connect_queue: adding {user} leave')
                         server.statistics[player_index]['leaves'].append(
-                            str(x.get('time')))
+                            str(x.time))
 
                 # Add modification to savelist to later be saved
                 save_dict = {'index':player_index,'uuid':uuid,'user':user}
@@ -779,59 +1113,432 @@ class GameCog(commands.Cog):
                 save_list.append(save_dict)
 
                 # Online List Logging
-                if join and not (x['username'] in server.online_players):
-                    logging.info(f'Adding {x["username"]} to online players')
-                    server.online_players.append(x['username'])
-                elif (not join) and (x['username'] in server.online_players):
-                    logging.info(f'Removing {x["username"]} from online players') 
-                    server.online_players.remove(x['username'])
-        except queue.Empty:
-            #logging.info(f'{server.server_name} queue.Empty exception')
-
-            # Update Header (Without hanging up execution, as I believe headers can only be updated so frequently)
+                if join and not (x.username in server.online_players):
+                    logging.info(f'Adding {x.username} to online players')
+                    server.online_players.append(x.username)
+                elif (not join) and (x.username in server.online_players):
+                    logging.info(f'Removing {x.username} from online players') 
+                    server.online_players.remove(x.username)
+        finally:
+            # Update Header, coalesced as headers can only be updated so frequently
             if save_list:
-                loop = asyncio.get_event_loop()
-                loop.create_task(self.header_update(server=server))
-                logging.info(f'Scheduled header_update for {server.server_name}')
+                self.header_update(server=server)
 
             # Save Statistics
             for index in save_list:
-                await asyncio.sleep(0)
-                self.save_statistics(
+                await Executor.run('disk', self.save_statistics,
                     server_name=server.server_name,
                     server=server,
                     uuid=index.get('uuid'),
                     username=index.get('user'),
                     index=index.get('index'))
 
+    async def lookup_player(self, server:Server, user:str) -> tuple:
+        """
+        Returns: `(uuid, player_index)` of user in server's statistics, adding
+        statistics for a new player. player_index is None if adding failed.
+
+        Raises asyncio.TimeoutError if a lookup times out.
+        """
+        uuid = await Executor.run('http', self.get_uuid, user)
+        logging.info(f'connect_queue user={user}, uuid={uuid}')
+
+        # Get index of player -- adding player if not present
+        player_index = await Executor.run('http', self.find_player, 
+            server=server, username=user, uuid=uuid)
+        logging.info(f'handle_connect_queue playerindex={player_index}')
+        if player_index == None:
+            logging.info(f'handle_connect_queue creating user')
+            await Executor.run('disk', self.create_statistics, 
+                server=server, username=user, uuid=uuid)
+
+            # Get new player_index
+            player_index = await Executor.run('http', self.find_player,
+                server=server, username=user, uuid=uuid)
+            logging.info(f'handle_connect_queue new playerindex is {player_index}')
+        return uuid, player_index
+
 #-------------------------Scheduled Tasks---------------------------------------
-    @tasks.loop(seconds=DB.get_chat_link_time())
-    async def pass_message(self):
+    def start_ingestion(self, server:Server):
+        """
+        Starts server's supervised ingestion task, and watching its container
+        through the docker events subscriber
+        """
+        server.ingest_task = self.bot.loop.create_task(self.ingest(server))
+        server.ingest_task.add_done_callback(
+            lambda task: self.on_ingest_done(server, task))
+        ContainerEvents.watch(server.docker_name,
+            lambda action, status, when: self.bot.loop.call_soon_threadsafe(
+                self.on_container_event, server, action, status, when))
+
+    def stop_ingestion(self, server:Server):
+        """
+        Cancels server's ingestion task, stops its log source and watching its
+        container
+        """
+        if server.ingest_task:
+            server.ingest_task.cancel()
+            server.ingest_task = None
+        server.log_source.stop()
+        ContainerEvents.unwatch(server.docker_name)
+
+    def close_server(self, server:Server):
+        """
+        Stops everything running for server; ingestion, its relay, chat and
+        header tasks and its rcon connection, saving its fingerprints
+        """
+        self.stop_ingestion(server)
+        if server.chat_task:
+            server.chat_task.cancel()
+        if server.relay_task:
+            server.relay_task.cancel()
+        server.header.stop()
+        server.fingerprint.save_fingerprintDB()
+        if server.rcon:
+            server.rcon.close()
+
+    def on_container_event(self, server:Server, action:str, status:str,
+        when:datetime):
+        """
+        Handles a container status change of server; pushes it to the header,
+        drops the cached handle of a removed container, and closes the
+        sessions of online players when the container stops.
+
+        Parameters:
+        ---
+        `action` : `str`
+            -- Docker event action, ie. 'die'
+        `status` : `str`
+            -- Docker status the container is now in, ie. 'exited'
+        `when` : `datetime`
+            -- Time of the change
+        """
+        if action == 'destroy':
+            server.invalidate_container()
+        if status in ('exited', 'removed'):
+            self.close_sessions(server, when)
+        self.header_update(server=server)
+
+    def close_sessions(self, server:Server, when:datetime):
+        """
+        Queues a leave at when for every online player of server, as players
+        of a container that died never log leaving. Leaves the game did log
+        are ignored by handle_connect_queue.
+        """
+        for username in list(server.online_players):
+            server.connect_queue.put(Event(username, "left the game.",
+                MessageType.LEAVE, COLORS['gold'], when, server.server_name))
+        if server.online_players:
+            logging.info(f"Closing {len(server.online_players)} sessions of "
+                f"stopped {server.server_name}")
+            server.wake()
+
+#------------------------- Chat Relay ------------------------------------------
+    def queue_chat(self, server:Server, message:str):
+        """
+        Queues message for relay to server, starting its relay task if idle.
+        Dropped, logged once per server, if it can not receive chat.
+        """
+        if not self.can_send_message(server):
+            if server.server_name not in self.chat_unconfigured:
+                self.chat_unconfigured.add(server.server_name)
+                logging.warning(f"{server.server_name} is not configured to "
+                    "receive chat, discord messages will not be relayed")
+            return
+        server.chat_outbox.append(message)
+        if server.chat_task is None or server.chat_task.done():
+            server.chat_task = self.bot.loop.create_task(self.relay_chat(server))
+
+    async def relay_chat(self, server:Server):
+        """
+        Relays server's chat_outbox in order until empty. Messages arriving
+        within DB.get_chat_coalesce_time() of each other are sent together.
+
+        Messages of a failed batch and those after it go back to the front of
+        chat_outbox, retried after a delay backed off like the breaker's
+        probes. The outbox keeps the newest DB.get_chat_queue_len() meanwhile.
         """
-        Reads servers on interval, sends new msgs to linked discord channel.
+        retry_min, retry_max = DB.get_breaker_backoff()
+        retry = retry_min
+        while server.chat_outbox:
+            await asyncio.sleep(DB.get_chat_coalesce_time())
+            messages = list(server.chat_outbox)
+            server.chat_outbox.clear()
+            sent = 0
+            for batch, count in self.pack_chat(messages):
+                try:
+                    await self.call(server, 'rcon', self.send_message,
+                        server, batch)
+                except Exception as e:
+                    logging.warning(f"{server.server_name} chat relay failed: "
+                        f"{e}, retrying in {retry}s")
+                    break
+                sent += count
+            else:
+                retry = retry_min
+                continue
+
+            # Requeue the unsent ahead of newer messages; maxlen drops oldest
+            pending = messages[sent:] + list(server.chat_outbox)
+            server.chat_outbox.clear()
+            server.chat_outbox.extend(pending)
+            await asyncio.sleep(retry)
+            retry = min(retry*2, retry_max)
+
+    def pack_chat(self, messages:list) -> list:
+        """
+        Returns: messages packed in order into newline joined batches whose
+        get_chat_command() fits get_chat_limit(), one batch per message if
+        the game has no chat command, as `(batch, count)` with count the
+        number of messages in batch. Messages too long alone are truncated.
+
+        Parameters:
+        ---
+        `messages` : `list`
+            -- Messages to pack, oldest first
+        """
+        if self.get_chat_command("") is None:
+            return [(message, 1) for message in messages]
+        limit = self.get_chat_limit()
+        fits = lambda text: len(self.get_chat_command(text).encode()) <= limit
+
+        batches = []
+        batch = None
+        count = 0
+        for message in messages:
+            while not fits(message) and message:
+                # Trim by the excess, escapes make it an underestimate
+                excess = len(self.get_chat_command(message).encode()) - limit
+                message = message[:-max(1, excess)]
+            if batch is not None and fits(f"{batch}\n{message}"):
+                batch = f"{batch}\n{message}"
+                count += 1
+            else:
+                if batch is not None:
+                    batches.append((batch, count))
+                batch = message
+                count = 1
+        if batch is not None:
+            batches.append((batch, count))
+        return batches
+
+    def on_ingest_done(self, server:Server, task:asyncio.Task):
+        """
+        Restarts an ingestion task which ended without being cancelled, after
+        a backed off delay. Gives up after DB.get_ingest_restarts() failures
+        in a row, ie. a bootstrap failing the same way every time.
+        """
+        if task.cancelled() or server.ingest_task is not task:
+            return
+        server.ingest_failures += 1
+        if server.ingest_failures > DB.get_ingest_restarts():
+            logging.critical(f"{server.server_name}.{server.cog_name} ingestion "
+                f"failed {server.ingest_failures} times in a row "
+                f"({task.exception()}), giving up")
+            server.ingest_task = None
+            return
+        server.backoff()
+        logging.error(f"{server.server_name}.{server.cog_name} ingestion "
+            f"ended unexpectedly ({task.exception()}), restarting in "
+            f"{server.current_interval}s")
+        server.ingest_task = self.bot.loop.create_task(
+            self.ingest(server, delay=server.current_interval))
+        server.ingest_task.add_done_callback(
+            lambda task: self.on_ingest_done(server, task))
+
+    def on_new_lines(self, server:Server):
+        """Wakes a backed off server when its log source receives lines"""
+        if server.current_interval > server.poll_interval:
+            server.wake()
+
+    async def ingest(self, server:Server, delay:float=0):
+        """
+        Ingestion task of a single server; bootstraps the server and starts
+        its log source, then passes messages on an adaptive interval. 
+        Waits delay seconds first, ie. when restarted after failing.
+
+        Passes every server.poll_interval seconds while lines flow or players
+        are online, otherwise backs off exponentially up to 
+        server.poll_ceiling. server.wake() snaps back to fast polling.
+
+        Errors are logged and isolated to this server's iteration, so a 
+        failing server can not stall or stop the others.
+        """
+        await asyncio.sleep(delay)
+        if not server.ready:
+            await self.bootstrap(server)
+        server.log_source.on_line = lambda: self.bot.loop.call_soon_threadsafe(
+            self.on_new_lines, server)
+        server.log_source.start()
+        server.ingest_failures = 0
+
+        await self.bot.wait_until_ready()
+        server.wake_event = asyncio.Event()
+        while True:
+            try:
+                active = await self.pass_message(server=server)
+            except Exception:
+                logging.exception(
+                    f"{server.server_name}.{server.cog_name} pass_message failed")
+                active = False
+
+            if active:
+                server.current_interval = server.poll_interval
+            else:
+                server.backoff()
+
+            try:
+                await asyncio.wait_for(server.wake_event.wait(),
+                    timeout=server.current_interval)
+            except asyncio.TimeoutError:
+                pass
+            server.wake_event.clear()
+
+    async def pass_message(self, server:Server) -> bool:
+        """
+        Returns: True if the server is active (new lines or players online)
+
+        Reads server, starting the relay of new msgs to linked discord channel.
         
-        Reads each server each interval, handles queues of each server each 
-        interval. Manages chat-link functionality from servers->discord.
+        Handles queues of the server each interval. Manages chat-link 
+        functionality from server->discord.
         """
-        for server in self.servers:
-            self.read(server)
-            ctx = self.bot.get_channel(server.cid)
+        if server.read_lock.locked():
+            # A read outlasted its timeout and is still running
+            logging.warning(f"{server.server_name} previous read still running, skipping read")
+            lines = 0
+        else:
+            lines = await Executor.run('disk', self.locked_read, server)
 
-            # Connect Queue
-            await self.handle_connect_queue(server=server)
-            
-            # Message Queue
+        # Connect Queue
+        await self.handle_connect_queue(server=server)
+        
+        # Outbox
+        self.start_relay(server)
+
+        # Batched fingerprint save
+        if server.fingerprint.is_due():
+            await Executor.run('disk', server.fingerprint.save_fingerprintDB)
+
+        return bool(lines or server.online_players)
+
+    def start_relay(self, server:Server):
+        """Starts server's relay task if its outbox has events and it is idle"""
+        if server.outbox and (server.relay_task is None
+            or server.relay_task.done()):
+            server.relay_task = self.bot.loop.create_task(
+                self.relay_outbox(server))
+
+    async def relay_outbox(self, server:Server):
+        """
+        Relays server's outbox until empty, a message's worth of events at a
+        time, highest priority first. Sends wait on the channel's rate limit,
+        so events arriving meanwhile are batched into the next message.
+        """
+        ctx = self.bot.get_channel(server.cid)
+        while server.outbox:
+            events, notices = server.outbox.take(RELAY_BATCH)
+            try:
+                if events:
+                    await self.relay(server, ctx, events)
+                if notices:
+                    await self.relay_events(ctx, notices, server.outbox.bucket)
+            except Exception as e:
+                logging.warning(f"{server.server_name} relay failed: {e}")
+
+    async def relay(self, server:Server, ctx, events:list):
+        """
+        Sends events to server's linked channel in order. With "relay":
+        "webhook" in its containers.json dict, chat goes through the channel's
+        webhook as the player, and other events (or chat the webhook fails to
+        send) through relay_events().
+        """
+        bucket = server.outbox.bucket
+        if server.server.get('relay') != 'webhook':
+            await self.relay_events(ctx, events, bucket)
+            return
+        for is_chat, run in itertools.groupby(events,
+            key=lambda event: event.type is MessageType.MSG):
+            run = list(run)
+            if is_chat:
+                run = await self.relay_webhook(server, run)
+            if run:
+                await self.relay_events(ctx, run, bucket)
+
+    async def relay_webhook(self, server:Server, events:list) -> list:
+        """
+        Returns: events not sent, after sending chat events through server's
+        webhook, consecutive messages of a player packed together.
+        """
+        webhook = await self.get_webhook(server)
+        if not webhook:
+            return events
+        sent = 0
+        for username, run in itertools.groupby(events,
+            key=lambda event: event.username):
+            run = list(run)
+            name = username.strip('<>')
             try:
-                while True:
-                    await ctx.send(embed=embed_message(server.message_queue.get_nowait()))
-            except queue.Empty:
-                await asyncio.sleep(0)
+                for content in pack_lines([discord.utils.escape_markdown(
+                    event.message) for event in run]):
+                    await Webhooks.execute(webhook, content, name,
+                        self.get_avatar_url(name))
+            except WebhookError as e:
+                logging.warning(f"{server.server_name} webhook relay failed: {e}")
+                return events[sent:]
+            sent += len(run)
+        return []
+
+    async def get_webhook(self, server:Server) -> Webhook:
+        """
+        Returns: Webhook Pinebot manages in server's channel, created on first
+        use. None (and False from then on) if it can't be managed.
+        """
+        if server.webhook is None:
+            channel = self.bot.get_channel(server.cid)
+            try:
+                hook = discord.utils.get(await channel.webhooks(),
+                    name=WEBHOOK_NAME)
+                if hook is None or hook.token is None:
+                    hook = await channel.create_webhook(name=WEBHOOK_NAME)
+                server.webhook = Webhooks.get(hook.id, hook.token)
+            except (discord.Forbidden, discord.HTTPException, AttributeError) as e:
+                logging.error(f"{server.server_name} webhook unavailable, "
+                    f"relaying as the bot: {e}")
+                server.webhook = False
+        return server.webhook
+
+    async def relay_events(self, ctx, events:list, bucket:RateBucket=None):
+        """
+        Sends events to a discord channel in order, batching bursts.
 
-            
-            
-    @pass_message.before_loop
-    async def before_pass_mc_message(self):
-        await self.bot.wait_until_ready() 
+        A lone event is sent as an embed. Several are sent up to 10 embeds per
+        message where the discord library supports it, otherwise packed into
+        escaped plain text messages of up to 2000 characters. Mentions are
+        disabled on every send, so game chat can not ping the guild.
+
+        Parameters:
+        ---
+        `ctx` : `discord.TextChannel`
+            -- Channel to send to
+        `events` : `list`
+            -- Events to send, oldest first
+        `bucket` : `RateBucket`
+            -- Rate limit each send waits on, if any
+        """
+        if len(events) == 1:
+            messages = [{'embed': embed_message(events[0])}]
+        elif SEND_EMBEDS:
+            messages = [{'embeds': [embed_message(event)
+                for event in events[i:i+10]]}
+                for i in range(0, len(events), 10)]
+        else:
+            messages = [{'content': content} for content in pack_text(events)]
+        for message in messages:
+            if bucket is not None:
+                await bucket.acquire()
+            await ctx.send(allowed_mentions=discord.AllowedMentions.none(),
+                **message)
 
     @commands.Cog.listener("on_message")
     async def on_disc_message(self, message):
@@ -844,5 +1551,6 @@ class GameCog(commands.Cog):
             return
         for server in self.servers:
             if message.channel.id == server.cid:
-                self.send_message(server=server, message=
-                    self.discord_message_format(server=server,message=message))
\ No newline at end of file
+                server.wake()
+                self.queue_chat(server, self.discord_message_format(
+                    server=server, message=message))
\ No newline at end of file
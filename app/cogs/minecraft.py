@@ -3,15 +3,19 @@ minecraft.py
 By: Emmett Peck
 A cog for discord.py that incorporates docker chatlink, header updating, and playtime logging.
 """
+import json
 import logging
 import discord
 from discord.ext import commands
 from discord.ext.commands import has_permissions, CheckFailure
 from database import DB
-from messages import MessageType, get_between, get_msg_dict, split_first
+from minecraft_grammar import get_grammar
 from username_to_uuid import UsernameToUUID
 from server import Server
 from embedding import embed_build
+from circuit_breaker import CircuitOpenError
+from executor import Executor
+from rcon import RconError
 import analytics_lib 
 
 
@@ -27,7 +31,12 @@ class Minecraft(GameCog):
     async def whitelist(self, ctx, *, mess):
         ''' Whitelists <args> to corresponding server as is defined in DChannels if user has applicable role'''
         # TODO server ARG
-        response = self.send(server=self.servers[self.find_server(ctx.channel.id)], command=f"whitelist add {mess}",logging=True)
+        server = self.servers[self.find_server(ctx.channel.id)]
+        try:
+            response = await self.call(server, 'rcon', self.send, server, f"whitelist add {mess}", True)
+        except (CircuitOpenError, RconError):
+            await ctx.send(f"{server.server_name} is unreachable, try again later.")
+            return
         if response:
             await ctx.send(response)
         else:
@@ -44,7 +53,11 @@ class Minecraft(GameCog):
         ''' Sends <args> as /<args> to corresponding server as is defined in DChannels if user has applicable role'''
         server = self.servers[self.find_server(ctx.channel.id)]
         logging.info(f"{ctx.author} sendcmd {mess} to {server.server_name}")
-        response = self.send(server=server, command=mess, log=True)
+        try:
+            response = await self.call(server, 'rcon', self.send, server, mess, True)
+        except (CircuitOpenError, RconError):
+            await ctx.send(f"{server.server_name} is unreachable, try again later.")
+            return
         logging.info(response)
         if response:
             await ctx.send(response)
@@ -61,53 +74,90 @@ class Minecraft(GameCog):
     # List ---------------------------------------------------------------------
     @commands.command(name='list', help="Usage `>list` in desired corresponding channel.", brief="Lists online players.")
     async def list(self, ctx):
-        response = self.send(server=self.servers[self.find_server(ctx.channel.id)], command="list")
+        server = self.servers[self.find_server(ctx.channel.id)]
+        try:
+            response = await self.call(server, 'rcon', self.send, server, "list")
+        except (CircuitOpenError, RconError):
+            await ctx.send(f"{server.server_name} is unreachable, try again later.")
+            return
         
         await ctx.message.delete()
         if response:
             await ctx.send(embed=embed_build(message=response, reference=ctx.author))
         else:
-            await ctx.send(embed=embed_build("Server not found. Use command only in 'Minecraft' text channels."))
+            await ctx.send(embed=embed_build("Server not found. Use command only in 'Minecraft' text channels.", reference=ctx.author))
 
 # OVERLOADS ----------------------------------------------------------------------------------
 
     def get_version(self) -> str:
         return "Minecraft"
 
+    def get_avatar_url(self, username:str) -> str:
+        """OVERLOAD: Minecraft, skin head of username"""
+        return f"https://mc-heads.net/avatar/{username}/64"
+
     def get_uuid(self, username:str):
         """Get player UUID from username"""
         if username == None:
             return None
 
-        converter = UsernameToUUID(username)
-        uuid = converter.get_uuid()
+        converter = UsernameToUUID(username, timeout=DB.get_io_timeouts()['http'])
+        try:
+            uuid = converter.get_uuid()
+        except OSError as e:
+            logging.error(f"get_uuid failed for {username}: {e}")
+            return None
         return uuid
 
-    def send(self, server:Server, command:str, log=False) -> list: 
+    async def send(self, server:Server, command:str, log=False) -> str: 
         """
         OVERLOAD: 
         Sends command to corresponding ITZD Minecraft docker server. Returns a str output of response.
+
+        Uses the server's persistent rcon connection if configured, falling back
+        to docker exec rcon-cli without one or if it fails.
         """
+        if server.rcon is not None:
+            try:
+                temp = await server.rcon.command(command)
+            except RconError as e:
+                logging.warning(f"{server.server_name} rcon failed, using docker exec: {e}")
+            else:
+                if log:
+                    logging.critical(f"Sent {command} to {server.server_name}.{server.cog_name}")
+                    logging.critical(f"Response: {temp}")
+                return temp
+
         filtered = command.replace("'", "'\\''") 
-        temp = super().send(server=server,command=f"rcon-cli '/{filtered}'", log=log, filter=False)
+        temp = await Executor.run('docker', super().send, server=server,
+            command=f"rcon-cli '/{filtered}'", log=log, filter=False)
         logging.info(f"Minecraft send return: {temp}")
         return temp
 
-    def send_message(self, server:Server, message:str):
+    async def send_message(self, server:Server, message:str):
         '''
         OVERLOAD: MC
-        Sends discord blue message to MC chat
+        Sends discord blue message to MC chat, one line per newline
         '''
-        self.send(server=server,command=f'tellraw @a {{"text":"{message}","color":"#7289da"}}')
+        await self.send(server=server,command=self.get_chat_command(message))
+
+    def get_chat_command(self, message:str) -> str:
+        """OVERLOAD: MC, tellraw of message"""
+        return "tellraw @a " + json.dumps(
+            {"text": message, "color": "#7289da"}, ensure_ascii=False)
 
-    def get_player_list(self, server:Server) -> list:
+    def get_chat_limit(self) -> int:
+        """OVERLOAD: MC, rcon packets over 1460 bytes are dropped"""
+        return 1400
+
+    async def get_player_list(self, server:Server) -> list:
         """ OVERLOAD: MC
         get_player_list(self) -> ["Playername", "Playername"...]
         For versions without a getlist function, returns None
 
         """
         player_list = []
-        response = self.send(server=server,command="list")
+        response = await self.send(server=server,command="list")
 
         # Response Catch
         if not response:
@@ -144,82 +194,21 @@ class Minecraft(GameCog):
                 return True
         return False
 
-    # Filter--------------------------------------------------------------------------------------------------------------------------------------------
-    def filter(self, server:Server, message:str, ignore=False):
+    @staticmethod
+    def get_prefix(version:str=None) -> str:
+        """OVERLOAD: Minecraft, INFO prefix of the version's grammar"""
+        return get_grammar(version).prefix
+
+    # Parse-------------------------------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def parse(message:str, version:str=None) -> tuple:
         """ 
-        OVERLOAD: Minecraft 1.18.2 Filter
-        Filters logs by to gameversion, adding leaves/joins to connectqueue and messages to message queue
+        OVERLOAD: Minecraft Parse
+        Parses log line with the compiled grammar of the server's flavour and version,
+        see minecraft_grammar. Returns (username, message, MessageType, discord.Color), plus the
+        death cause for deaths, None if not an event
         """
-        # Fingerprint Filtering
-        if server.fingerprint.is_unique_fingerprint(message):
-            post = None
-
-            # Ensure '[Server thread/INFO]:' ----------------------------------------------------------------------
-            info_split = message.split('] [Server thread/INFO]',1)
-            if len(info_split) != 2:
-                return
-
-            # Separate time; break apart entry from info ----------------------------------------------------------
-            entry = split_first(info_split[1],':')[1].strip()
-            time = split_first(info_split[0], '[')[1]
-
-            # Message Detection using <{user}> {msg} --------------------------------------------------------------
-            if (entry[0] == '<') and ('<' and '>' in entry):
-                msg  = split_first(entry,'> ')[1]
-                user = get_between(entry, '<','>')
-                post = get_msg_dict(f'<{user}>', msg, MessageType.MSG, discord.Color.green())
-
-            # Join/Leave Detection by searching for "joined the game." and "left the game."------------------------
-            elif entry.find(" joined the game") >= 0: 
-                msg = "joined the game"
-                user = entry.split(' ',1)[0]
-                post = get_msg_dict(user, msg, MessageType.JOIN, discord.Color.dark_teal())
-            elif entry.find(" left the game") >= 0:
-                msg = "left the game"
-                user = entry.split(' ',1)[0]
-                post = get_msg_dict(user, msg, MessageType.LEAVE, discord.Color.dark_teal())
-
-            # Achievement Detection ------------------------------------------------------------------------------
-            elif entry.find("has made the advancement") >= 0:
-                user = entry.split(' ',1)[0]
-                msg = f"has made the advancement [{split_first(entry,'[')[1]}"
-                post = get_msg_dict(user, msg, MessageType.ACHIEVEMENT, discord.Color.gold())
-
-            # Challenge Detection --------------------------------------------------------------------------------
-            elif entry.find("has completed the challenge") >= 0:
-                user = entry.split(' ',1)[0]
-                msg = f"has completed the challenge [{split_first(entry,'[')[1]}"
-                post = get_msg_dict(user, msg, MessageType.ACHIEVEMENT, discord.Color.dark_purple())
-
-            # Death Message Detection ----------------------------------------------------------------------------
-            else:
-                dm = Death(entry)
-                if dm.is_death():
-                    post = get_msg_dict(dm.player, dm.stripped_msg, MessageType.DEATH, discord.Color.red())
-
-            # If Not Ignore, Messages are sent and accounted for playtime
-            if post and (not ignore):
-                if post.get('type') == MessageType.JOIN or post.get('type') == MessageType.LEAVE:
-                    post["server"] = server.server_name
-                    server.connect_queue.put(post)
-                server.message_queue.put(post)
-
-# Deaths--------------------------------------------------------------------------------------------------------------------------------------------
-class Death:
-    """Filters death messages using startswith and possible MC death messages"""
-
-    def __init__(self, msg):
-        self.msg = msg.strip()
-        self.player = self.msg.split()[0]
-        self.stripped_msg = self.msg.split(self.player)[1].strip()
-        self.death_msg_startw = ["was shot by","was pummeled by","was pricked to death","walked into a cactus whilst trying to escape","drowned","drowned whilst trying to escape","experienced kinetic energy","experienced kinetic energy whilst trying to escape","blew up","was blown up by","was killed by","hit the ground too hard","fell from a high place","fell off a ladder","fell off some vines","fell off some weeping vines","fell off some twisting vines","fell off scaffolding","fell while climbing","was impaled on a stalagmite","was squashed by a falling anvil","was squashed by a falling block","was skewered by a falling stalactite","went up in flames","burned to death","was burnt to a crisp whilst fighting","went off with a bang","tried to swim in lava","was struck by lightning","discovered the floor was lava","walked into danger zone due to","was killed by magic","was killed by","froze to death","was frozen to death by","was slain by","was fireballed by","was stung to death","was shot by a skull from","starved to death","suffocated in a wall","was squished too much","was squashed by","was poked to death by a sweet berry bush","was killed trying to hurt","was impaled by","fell out of the world","didn't want to live in the same world as","withered away","died from dehydration","died","was roasted in dragon breath","was doomed to fall","fell too far and was finished by","was stung to death by","went off with a bang","was killed by even more magic","was too soft for this world","was obliterated by a sonically-charged shriek"]
-
-    def is_death(self):
-        """Checks if playerless string matches death message"""
-        for item in self.death_msg_startw:
-            if self.stripped_msg.startswith(item):
-                return True
-        return False
+        return get_grammar(version).parse(message)
 
 # ------------------------------------------------------------------------------------------------------------------------------------------------
 
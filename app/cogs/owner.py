@@ -55,7 +55,7 @@ class OwnerCog(commands.Cog):
         # Add & save container registry
         DB.add_container(sDict)
         server = self.bot.get_cog(split_first(version,':')[0].title())
-        server.servers.append(sDict)
+        server.add_server(sDict)
 
         await ctx.send(f"Server {sDict} Added Successfully")
         print(f"Server {sDict} Added Successfully")
@@ -79,7 +79,7 @@ class OwnerCog(commands.Cog):
 
             # Remove server from corresponding cog
             server = self.bot.get_cog(split_first(version,':')[0].title())
-            server.servers.remove(rDict)
+            server.remove_server(cid=ctx.channel.id)
         except:
             await ctx.send(f"Server {name} {rDict} Removal Failed")
             print(f"Server {name} {rDict} Removal Failed")
@@ -0,0 +1,95 @@
+"""
+Module containing the extension building GameCogs from declarative game specs.
+
+Every spec in DB.get_spec_dir() (see game_spec.py) becomes a SpecGameCog
+subclass named by the spec, built when this module is imported so ingestion
+worker processes can find them by name through the module's __getattr__. Loading the extension adds a cog for
+every spec whose game has no cog yet, so list it after the hand-written game
+cogs in cogs.json; the reference Factorio and Minecraft specs then only stand
+in for those cogs if they are not loaded.
+
+Authors: Emmett Peck (EmmettPeck)
+Version: October 18th, 2026
+"""
+
+import logging
+import os
+import re
+
+from cogs.gamecog import GameCog
+from database import DB
+from game_spec import GameSpec
+
+
+class SpecGameCog(GameCog):
+    """
+    A GameCog parsing logs with a GameSpec, subclassed per spec.
+
+    Attributes
+    ---
+    `spec` : `GameSpec`
+        -- The spec of the game, set by subclasses
+    """
+    spec = None
+
+    def get_version(self) -> str:
+        return self.spec.name
+
+    @classmethod
+    def get_prefix(cls, version:str=None) -> str:
+        """OVERLOAD: Spec, prefix of the spec"""
+        return cls.spec.prefix
+
+    @classmethod
+    def parse(cls, message:str, version:str=None) -> tuple:
+        """
+        OVERLOAD: Spec
+        Parses log line with the spec's rules for version into
+        (username, message, MessageType, discord.Color), None if not an event
+        """
+        return cls.spec.parse(message, version)
+
+def load_spec_cogs(spec_dir:str) -> dict:
+    """
+    Returns: dict of SpecGameCog subclasses by name, of every valid spec in
+    spec_dir. Invalid specs are logged and skipped, as are specs whose name is
+    not an identifier or is taken by this module or an earlier spec.
+    """
+    cogs = {}
+    if not os.path.isdir(spec_dir):
+        logging.warning(f"Game spec directory {spec_dir} not found, "
+            "no spec games loaded")
+        return cogs
+    for file in sorted(os.listdir(spec_dir)):
+        if not file.endswith('.json'):
+            continue
+        path = os.path.join(spec_dir, file)
+        try:
+            spec = GameSpec.load(path)
+            if not spec.name.isidentifier():
+                raise ValueError(f"name {spec.name!r} is not an identifier")
+            if spec.name in globals() or spec.name in cogs:
+                raise ValueError(f"name {spec.name!r} is already taken")
+        except (OSError, ValueError, KeyError, re.error) as e:
+            logging.error(f"Skipping invalid game spec {path}: {e}")
+            continue
+        cog = type(spec.name, (SpecGameCog,), {'spec': spec, '__module__': __name__})
+        cogs[spec.name] = cog
+    return cogs
+
+spec_cogs = load_spec_cogs(DB.get_spec_dir())
+
+def __getattr__(name:str):
+    """Resolves spec cogs by name, so classes pickled by name load in workers"""
+    try:
+        return spec_cogs[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def setup(bot):
+    for name, cog in spec_cogs.items():
+        if bot.get_cog(name) is not None:
+            logging.info(f"{name} cog already loaded, skipping its spec")
+            continue
+        bot.add_cog(cog(bot))
+        logging.info(f"Loaded {name} cog from spec")
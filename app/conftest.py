@@ -0,0 +1,17 @@
+"""
+Test setup; DB loads ../data relative to the working directory on import, so
+tests run from app/ of a scratch tree holding empty settings.
+
+Authors: Emmett Peck (EmmettPeck)
+Version: October 18th, 2026
+"""
+
+import os
+import sys
+
+APP = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, APP)
+
+from data_tree import enter_data_tree
+
+SCRATCH = enter_data_tree('pinebot-test-')
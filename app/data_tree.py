@@ -0,0 +1,39 @@
+"""
+Module setting up an empty data tree to run Pinebot modules outside a
+deployment, ie. in tests and benchmarks. DB loads ../data relative to the
+working directory on import, so callers enter the tree before importing it.
+
+Authors: Emmett Peck (EmmettPeck)
+Version: October 18th, 2026
+"""
+
+import json
+import os
+import tempfile
+
+# Settings files DB loads, and their empty contents
+SETTINGS = (
+    ('data/containers.json', []),
+    ('data/role_Whitelist.json', []),
+    ('data/settings/cogs.json', {'cogs': [], 'gamecogs': []}),
+)
+
+def enter_data_tree(prefix:str) -> str:
+    """
+    Creates a temporary tree of empty settings and changes the working
+    directory to its app/. Returns: path of the tree
+
+    Parameters:
+    ---
+    `prefix` : `str`
+        -- Prefix of the temporary directory's name
+    """
+    root = tempfile.mkdtemp(prefix=prefix)
+    for path, content in SETTINGS:
+        path = os.path.join(root, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as write_file:
+            json.dump(content, write_file)
+    os.makedirs(os.path.join(root, 'app'))
+    os.chdir(os.path.join(root, 'app'))
+    return root
@@ -8,6 +8,9 @@ Version: May 27th, 2022
 """
 
 import json
+import os
+import threading
+
 import docker
 
 def singleton(cls):
@@ -21,18 +24,125 @@ class DB:
     """
     def __init__(self):
         self.CHAT_LINK_TIME = 1
-        self.TAIL_LEN = 20
+        self.CHAT_COALESCE_TIME = 0.25 # Seconds discord->game chat is gathered
+        self.CHAT_QUEUE_LEN = 200 # Undelivered discord->game messages kept
+        self.POLL_CEILING = 30
+        self.INGEST_PROCESSES = 0 # Parse logs in worker processes if > 0
+        self.INGEST_RESTARTS = 5 # Failed ingestion restarts before giving up
+        self.FINGERPRINT_WINDOW = 100
+        self.FINGERPRINT_SAVE_INTERVAL = 30
+        self.IO_WORKERS = 16
+        self.IO_LIMITS = {'docker': 8, 'rcon': 4, 'disk': 4, 'http': 2}
+        # 'rcon' covers an rcon command (2*RCON_TIMEOUT at most) and the
+        # docker exec fallback after it ('docker')
+        self.IO_TIMEOUTS = {'docker': 10, 'rcon': 20, 'disk': 30, 'http': 5}
+        self.RCON_TIMEOUT = 4 # Seconds to connect & for each rcon response
+        self.BREAKER_THRESHOLD = 3
+        self.BREAKER_BACKOFF = (5, 300) # Min, Max seconds between probes
+        self.OUTBOX_LIMITS = {'connect': 100, 'event': 100, 'chat': 200}
+        self.OUTBOX_OVERFLOW = "collapse" # See outbox.py
+        self.CHANNEL_RATE = (5, 5) # Messages per seconds discord allows a channel
+        self.HEADER_RATE = (2, 600) # Topic edits per seconds discord allows a channel
+        self.HEADER_DEBOUNCE = 5 # Seconds header update requests are gathered
+        self.UPTIME_WINDOW = 7 # Days >uptime reports the share of time up over
+        self.SPEC_DIR = "specs" # Declarative game specs (relative to app/)
+        self.DISCORD_API = "https://discord.com/api/v10" # Webhook relay base
 
         self.load_containers()
         self.load_role_whitelist()
         self.load_cogs()
-        self.client = docker.from_env()
+        self._client = None
+        self._client_lock = threading.Lock()
+
+    @property
+    def client(self):
+        """
+        The shared docker client, connected on first use so importing this
+        module (ie. in ingestion workers or tests) needs no docker daemon.
+        """
+        with self._client_lock:
+            if self._client is None:
+                self._client = docker.from_env(
+                    timeout=self.IO_TIMEOUTS['docker'],
+                    max_pool_size=self.get_docker_pool_size())
+            return self._client
+
+    def get_docker_pool_size(self):
+        """
+        Returns: keep-alive connections of the docker client; a log stream per
+        container, the events stream, and every concurrent docker & rcon call,
+        so requests never wait on a socket
+        """
+        return (len(self.containers) + 1
+            + self.IO_LIMITS['docker'] + self.IO_LIMITS['rcon'])
 
     def get_chat_link_time(self):
         return self.CHAT_LINK_TIME
 
-    def get_tail_len(self):
-        return self.TAIL_LEN
+    def get_chat_coalesce_time(self):
+        return self.CHAT_COALESCE_TIME
+
+    def get_chat_queue_len(self):
+        return self.CHAT_QUEUE_LEN
+
+    def get_poll_ceiling(self):
+        return self.POLL_CEILING
+
+    def get_ingest_processes(self):
+        return self.INGEST_PROCESSES
+
+    def get_ingest_restarts(self):
+        return self.INGEST_RESTARTS
+
+    def get_fingerprint_window(self):
+        return self.FINGERPRINT_WINDOW
+
+    def get_fingerprint_save_interval(self):
+        return self.FINGERPRINT_SAVE_INTERVAL
+
+    def get_io_workers(self):
+        return self.IO_WORKERS
+
+    def get_io_limits(self):
+        return self.IO_LIMITS
+
+    def get_io_timeouts(self):
+        return self.IO_TIMEOUTS
+
+    def get_rcon_timeout(self):
+        return self.RCON_TIMEOUT
+
+    def get_breaker_threshold(self):
+        return self.BREAKER_THRESHOLD
+
+    def get_breaker_backoff(self):
+        return self.BREAKER_BACKOFF
+
+    def get_outbox_limits(self):
+        return self.OUTBOX_LIMITS
+
+    def get_outbox_overflow(self):
+        return self.OUTBOX_OVERFLOW
+
+    def get_channel_rate(self):
+        return self.CHANNEL_RATE
+
+    def get_header_rate(self):
+        return self.HEADER_RATE
+
+    def get_header_debounce(self):
+        return self.HEADER_DEBOUNCE
+
+    def get_uptime_window(self):
+        return self.UPTIME_WINDOW
+
+    def get_discord_api(self):
+        return self.DISCORD_API
+
+    def get_spec_dir(self):
+        """Returns: SPEC_DIR, resolved against app/ if relative"""
+        return os.path.join(os.path.dirname(os.path.abspath(__file__)),
+            self.SPEC_DIR)
 
     def get_cogs(self):
         return self.COGS + self.GAME_COGS
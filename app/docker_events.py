@@ -0,0 +1,346 @@
+"""
+Module containing the shared subscriber to the docker events API.
+
+One background thread holds a single `client.events()` stream for every
+watched container, keeping a status table in memory so a container's status is
+a dictionary lookup rather than a docker round trip. Each start and stop is
+persisted as an uptime interval to data/uptime/uptime_{docker_name}.json, and
+handed to the container's watcher, ie. its GameCog, as it happens.
+
+On every (re)connect the table is seeded by listing the watched containers, so
+transitions missed while disconnected (or while Pinebot was down) are recorded
+at the times docker reports in the container's state.
+
+Authors: Emmett Peck (EmmettPeck)
+Version: October 18th, 2026
+"""
+
+from datetime import datetime, timedelta
+import json
+import logging
+import os
+import threading
+import time
+
+from database import DB, singleton
+from log_sources import nanos_to_datetime, parse_timestamp
+
+# Container event actions and the status each leaves a container in
+ACTIONS = {
+    'start': 'running',
+    'unpause': 'running',
+    'pause': 'paused',
+    'die': 'exited',
+    'destroy': 'removed',
+}
+
+def describe_status(status:str) -> str:
+    """Returns: "Online" if a docker status is running, otherwise "Offline" """
+    if status.title().strip() == 'Running':
+        return "Online"
+    return "Offline"
+
+def parse_state_time(stamp:str) -> datetime:
+    """
+    Returns: local naive datetime of a docker state timestamp, None if unset
+
+    parse_state_time('2022-05-27T12:34:56.123456789Z') --> datetime
+    """
+    if not stamp or stamp.startswith('0001-'):
+        return None
+    return nanos_to_datetime(parse_timestamp(stamp))
+
+
+class UptimeLog:
+    """
+    Persisted start/stop intervals of a container.
+
+    Attributes
+    ---
+    `name` : `str`
+        -- Docker name of the container
+    `intervals` : `list`
+        -- `[start, stop]` datetimes oldest first, stop None while running
+    """
+
+    def __init__(self, docker_name:str):
+        self.name = docker_name
+        self.intervals = []
+        self.lock = threading.Lock()
+        self.load_uptime()
+
+    def get_path(self) -> str:
+        return rf"data/uptime/uptime_{self.name}.json"
+
+    def load_uptime(self):
+        try:
+            with open(self.get_path(), 'r') as read_file:
+                intervals = json.load(read_file).get('intervals', [])
+        except (FileNotFoundError, json.JSONDecodeError):
+            logging.info(f"No uptime log for {self.name}, starting one")
+            return
+        self.intervals = [[datetime.fromisoformat(start),
+            datetime.fromisoformat(stop) if stop else None]
+            for start, stop in intervals]
+
+    def save_uptime(self):
+        os.makedirs(os.path.dirname(self.get_path()), exist_ok=True)
+        with open(self.get_path() + '.tmp', 'w') as write_file:
+            json.dump({'intervals': [[start.isoformat(),
+                stop.isoformat() if stop else None]
+                for start, stop in self.intervals]}, write_file, indent = 2)
+        os.replace(self.get_path() + '.tmp', self.get_path())
+
+    def is_open(self) -> bool:
+        """Returns: True if the last interval has not stopped"""
+        return bool(self.intervals) and self.intervals[-1][1] is None
+
+    def record_start(self, when:datetime):
+        """Opens an interval, unless one is open"""
+        with self.lock:
+            if self.is_open():
+                return
+            self.intervals.append([when, None])
+            self.save_uptime()
+
+    def record_stop(self, when:datetime):
+        """Closes the open interval, if any"""
+        with self.lock:
+            if not self.is_open():
+                return
+            self.intervals[-1][1] = max(when, self.intervals[-1][0])
+            self.save_uptime()
+
+    def get_current(self, now:datetime=None) -> timedelta:
+        """
+        Returns: time since the last start if running, otherwise since the
+        last stop; None if never started
+        """
+        if not self.intervals:
+            return None
+        now = now if now else datetime.now()
+        start, stop = self.intervals[-1]
+        return now - (start if stop is None else stop)
+
+    def get_uptime(self, since:datetime, now:datetime=None) -> timedelta:
+        """Returns: time running between since and now"""
+        now = now if now else datetime.now()
+        total = timedelta()
+        for start, stop in self.intervals:
+            start = max(start, since)
+            stop = min(stop if stop else now, now)
+            if stop > start:
+                total += stop - start
+        return total
+
+
+@singleton
+class ContainerEvents:
+    """
+    A singleton subscriber to docker container events, started on first watch.
+
+    Attributes
+    ---
+    `statuses` : `dict`
+        -- Docker status by docker name, of watched containers seen
+    `watchers` : `dict`
+        -- callback(action, status, when) by docker name, called from the
+        subscriber thread on every transition
+    `logs` : `dict`
+        -- UptimeLog by docker name
+    """
+    RETRY_MIN = 1   # Seconds before first reconnect attempt
+    RETRY_MAX = 30  # Ceiling of reconnect backoff
+    JOIN_TIMEOUT = 5 # Seconds a restart waits for the old subscriber to exit
+
+    def __init__(self):
+        self.statuses = {}
+        self.watchers = {}
+        self.logs = {}
+        self.running = False
+        self._lock = threading.RLock() # Serializes starting & stopping
+        self._stream_lock = threading.Lock() # Guards _stream
+        self._logs_lock = threading.Lock() # Loads each UptimeLog once
+        self._stopped = None # Set to stop the current subscriber thread
+        self._stream = None
+        self._thread = None
+
+    def get_status(self, docker_name:str) -> str:
+        """Returns: docker status of a watched container, None if not yet seen"""
+        return self.statuses.get(docker_name)
+
+    def get_log(self, docker_name:str) -> UptimeLog:
+        """Returns: UptimeLog of a container, loaded on first use"""
+        with self._logs_lock:
+            log = self.logs.get(docker_name)
+            if log is None:
+                log = self.logs[docker_name] = UptimeLog(docker_name)
+            return log
+
+    def watch(self, docker_name:str, callback=None):
+        """
+        Tracks a container's status and uptime, calling callback on its
+        transitions. Starts the subscriber if not running. Never blocks, so
+        it may be called from the event loop; uptime logs are loaded and
+        containers seeded by the subscriber.
+
+        Parameters:
+        ---
+        `docker_name` : `str`
+            -- Name of the container to watch
+        `callback` : `callable`
+            -- callback(action, status, when), called from the subscriber
+            thread, ie. 'die', 'exited', datetime
+        """
+        with self._lock:
+            self.watchers[docker_name] = callback
+            if self.running:
+                # Seed the new container without waiting for a reconnect
+                threading.Thread(target=self.seed_new, args=(docker_name,),
+                    daemon=True).start()
+                return
+            self.running = True
+            self._stopped = threading.Event()
+            self._thread = threading.Thread(
+                target=self._restart,
+                args=(self._stopped, self._thread),
+                name="docker-events",
+                daemon=True)
+            self._thread.start()
+        logging.info("Started docker events subscriber")
+
+    def unwatch(self, docker_name:str):
+        """Stops watching a container, and the subscriber once none are left"""
+        with self._lock:
+            self.watchers.pop(docker_name, None)
+            self.statuses.pop(docker_name, None)
+            if not self.watchers:
+                self.stop()
+
+    def stop(self):
+        """Stops the subscriber, closing the open stream to unblock it"""
+        with self._lock:
+            if not self.running:
+                return
+            self.running = False
+            self._stopped.set()
+            with self._stream_lock:
+                if self._stream is not None:
+                    try:
+                        self._stream.close()
+                    except Exception as e:
+                        logging.warning(f"Docker events close raised {e}")
+        logging.info("Stopped docker events subscriber")
+
+    def transition(self, docker_name:str, action:str, status:str,
+        when:datetime):
+        """Records a container's new status, its uptime and notifies watcher"""
+        self.statuses[docker_name] = status
+        log = self.get_log(docker_name)
+        if status == 'running':
+            log.record_start(when)
+        elif status in ('exited', 'removed'):
+            log.record_stop(when)
+        logging.info(f"Container {docker_name} {action}: {status}")
+
+        callback = self.watchers.get(docker_name)
+        if callback is not None:
+            try:
+                callback(action, status, when)
+            except Exception as e:
+                logging.error(f"{docker_name} {action} watcher raised {e}")
+
+    def seed(self, names:list=None):
+        """
+        Fills the status table by listing watched containers, recording the
+        transitions missed since they were last seen.
+        """
+        names = list(self.watchers) if names is None else names
+        found = {container.name: container
+            for container in DB.client.containers.list(all=True)
+            if container.name in names}
+        for name in names:
+            container = found.get(name)
+            if container is None:
+                status, when = 'removed', datetime.now()
+            else:
+                state = container.attrs.get('State', {})
+                status = container.status
+                stamp = (state.get('StartedAt') if status == 'running'
+                    else state.get('FinishedAt'))
+                when = parse_state_time(stamp) or datetime.now()
+
+            known = self.statuses.get(name)
+            if known is None:
+                # First sight; the uptime log knows if it was running before
+                known = 'running' if self.get_log(name).is_open() else 'exited'
+                self.statuses[name] = known
+            if status != known:
+                action = 'start' if status == 'running' else 'die'
+                self.transition(name, action, status, when)
+
+    def seed_new(self, docker_name:str):
+        """Thread target; seeds a container watched while streaming"""
+        try:
+            self.seed([docker_name])
+        except Exception as e:
+            logging.warning(f"Docker events seed of {docker_name} failed: {e}")
+
+    def _restart(self, stopped:threading.Event, previous:threading.Thread):
+        """
+        Thread target; waits for the previous subscriber, if any, to exit
+        once its stream or wait unblocks, then follows events
+        """
+        if previous is not None:
+            previous.join(self.JOIN_TIMEOUT)
+            if previous.is_alive():
+                logging.warning("Old docker events subscriber still exiting")
+        self._follow(stopped)
+
+    def _follow(self, stopped:threading.Event):
+        """
+        Thread target; streams container events until stopped is set. Each
+        subscriber has its own stopped, so one left exiting after stop()
+        never runs alongside its replacement.
+        """
+        retry = self.RETRY_MIN
+        while not stopped.is_set():
+            stream = None
+            try:
+                since = int(time.time())
+                self.seed()
+                stream = DB.client.events(decode=True, since=since,
+                    filters={'type': 'container', 'event': list(ACTIONS)})
+                with self._stream_lock:
+                    if stopped.is_set():
+                        stream.close()
+                        return
+                    self._stream = stream
+                retry = self.RETRY_MIN
+                for event in stream:
+                    if stopped.is_set():
+                        return
+                    self.handle(event)
+            except Exception as e:
+                if not stopped.is_set(): # Not closed by stop()
+                    logging.warning(
+                        f"Docker events stream failed: {e}, retrying in {retry}s")
+            finally:
+                with self._stream_lock:
+                    if stream is not None and self._stream is stream:
+                        self._stream = None
+
+            # Stream ended or failed, wait before reconnecting
+            if not stopped.wait(retry):
+                retry = min(retry*2, self.RETRY_MAX)
+
+    def handle(self, event:dict):
+        """Applies a decoded docker event to the status table"""
+        action = event.get('Action', event.get('status'))
+        name = event.get('Actor', {}).get('Attributes', {}).get('name')
+        if name not in self.watchers or action not in ACTIONS:
+            return
+        if self.statuses.get(name) == ACTIONS[action]:
+            return # Replayed, or already seeded
+        nanos = event.get('timeNano') or event.get('time', time.time())*10**9
+        self.transition(name, action, ACTIONS[action], nanos_to_datetime(nanos))
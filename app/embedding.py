@@ -11,6 +11,9 @@ from messages import get_type_icon, split_first
 from datetime import datetime
 from analytics_lib import td_format
 
+EMBED_TITLE_LIMIT = 256
+MESSAGE_LIMIT = 2000
+
 
 def embed_server_list(reference:discord.Member, input:list):
     """
@@ -132,9 +135,50 @@ def embed_build(message:str, reference:discord.Member):
         icon_url= reference.avatar_url)
     return embed
 
-def embed_message(msg_dict):
+def format_event(event) -> str:
+    """Returns: one line describing an Event, ie. 💬 <Steve> hi"""
+    return f"{get_type_icon(event.type)} {event.username} {event.message}"
+
+def embed_message(event):
     return discord.Embed(
-        title=f"{get_type_icon(msg_dict.get('type'))}"
-            f" {msg_dict.get('username')} {msg_dict.get('message')}",
-        color = msg_dict.get("color"))
+        title=truncate(format_event(event), EMBED_TITLE_LIMIT),
+        color = event.color)
+
+def pack_text(events:list, limit:int=MESSAGE_LIMIT) -> list:
+    """
+    Returns: list of message contents of up to limit characters, each holding
+    the lines of consecutive events, in order.
+    """
+    return pack_lines([escape_text(format_event(event)) for event in events],
+        limit)
+
+def escape_text(text:str) -> str:
+    """
+    Returns: text escaped to send as plain message content; markdown renders
+    literally and @everyone, @here, user & role mentions can not ping.
+    """
+    return discord.utils.escape_mentions(discord.utils.escape_markdown(text))
+
+def pack_lines(lines:list, limit:int=MESSAGE_LIMIT) -> list:
+    """
+    Returns: list of message contents of up to limit characters, each holding
+    consecutive lines joined by newlines, in order. Long lines are truncated.
+    """
+    contents = []
+    content = ""
+    for line in lines:
+        line = truncate(line, limit)
+        if content and len(content) + 1 + len(line) <= limit:
+            content = f"{content}\n{line}"
+        else:
+            if content:
+                contents.append(content)
+            content = line
+    if content:
+        contents.append(content)
+    return contents
+
+def truncate(text:str, limit:int) -> str:
+    """Returns: text cut to limit characters, ending in … if cut"""
+    return text if len(text) <= limit else text[:limit-1] + "…"
     
\ No newline at end of file
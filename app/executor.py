@@ -0,0 +1,69 @@
+"""
+Module containing singleton class for running blocking calls off the event loop.
+
+Docker, rcon, disk, and http calls are synchronous; awaiting them through the
+Executor runs them on a bounded thread pool so one slow container can not
+freeze the gateway heartbeat or other commands.
+
+Authors: Emmett Peck (EmmettPeck)
+Version: October 18th, 2026
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import logging
+
+from database import DB, singleton
+
+@singleton
+class Executor:
+    """
+    A singleton bounded thread pool with an async façade, shared by all cogs.
+
+    Each call is made under a call type ('docker', 'rcon', 'disk', 'http')
+    whose concurrency is limited separately by DB.get_io_limits(), so a burst
+    of one kind of call can not occupy every worker. Calls are awaited for at
+    most DB.get_io_timeouts() seconds of their type.
+    """
+    def __init__(self):
+        self.pool = ThreadPoolExecutor(
+            max_workers=DB.get_io_workers(),
+            thread_name_prefix="pinebot-io")
+        self.semaphores = {}
+
+    def get_semaphore(self, call_type:str) -> asyncio.Semaphore:
+        """Returns: semaphore limiting call_type, created on first use"""
+        if call_type not in self.semaphores:
+            limit = DB.get_io_limits().get(call_type, DB.get_io_workers())
+            self.semaphores[call_type] = asyncio.Semaphore(limit)
+        return self.semaphores[call_type]
+
+    async def run(self, call_type:str, func, *args, **kwargs):
+        """
+        Returns: result of func(*args, **kwargs) run on the thread pool, or
+        awaited directly if func is a coroutine function
+
+        Raises asyncio.TimeoutError if the call outlasts its type's timeout, the
+        worker thread is left to finish on its own.
+
+        Parameters:
+        ---
+        `call_type` : `str`
+            -- Kind of blocking call, limits concurrency of that kind
+        `func` : `callable`
+            -- Blocking function or coroutine function to call
+        """
+        async with self.get_semaphore(call_type):
+            if asyncio.iscoroutinefunction(func):
+                # Native async clients (ie. rcon.py) only share limits & timeout
+                call = func(*args, **kwargs)
+            else:
+                call = asyncio.get_event_loop().run_in_executor(
+                    self.pool, functools.partial(func, *args, **kwargs))
+            return await asyncio.wait_for(call,
+                timeout=DB.get_io_timeouts().get(call_type))
+
+    def shutdown(self):
+        logging.info("Shutting down executor")
+        self.pool.shutdown(wait=False)
@@ -1,63 +1,127 @@
 """
 fingerprints.py
 By: Emmett Peck
-Log and filter out past 100 non-unique fingerprints per class
+Log and filter out the past non-unique fingerprints per class, within a window
+of DB.get_fingerprint_window() lines.
 """
 
 import json
 import hashlib
 import logging
+import os
+import time
+
+from database import DB
 
 class FingerPrints:
+    """
+    Window of fingerprints of the most recent unique log lines of a server.
+
+    Fingerprints are the first DIGEST_SIZE bytes of a line's sha256 digest,
+    held in a ring buffer (one flat bytearray of fixed width slots) paired
+    with a set of the same digests, so checking and adding a line costs O(1)
+    whatever the window size.
+
+    The window is saved to data/hashes/hash_{name}.bin as its digests oldest
+    first, written to a temporary file and renamed over the old one. Saves are
+    batched; new fingerprints only mark the window dirty, and owners call
+    save_if_due() on a timer and save_fingerprintDB() on shutdown.
+    """
+    DIGEST_SIZE = 16
 
-    def __init__(self, docker_name):
+    def __init__(self, docker_name, size=None):
         self.name = docker_name
-        self.fingerprintDB = self.load_fingerprintDB()
-    
+        self.size = size if size else DB.get_fingerprint_window()
+        self.ring = bytearray(self.size * self.DIGEST_SIZE)
+        self.head = 0       # Slot the next fingerprint is written to
+        self.count = 0      # Filled slots
+        self.members = set()
+        self.dirty = False
+        self.saved_at = time.monotonic()
+        self.path = rf"data/hashes/hash_{self.name}.bin"
+        self.load_fingerprintDB()
+
     def load_fingerprintDB(self):
         try:
-            with open(rf"data/hashes/hash_{self.name}.json", 'r') as read_file:
-                return json.load(read_file)
+            with open(self.path, 'rb') as read_file:
+                data = read_file.read()
         except FileNotFoundError:
-            with open(rf"data/hashes/hash_{self.name}.json", 'w+') as write_file:
-                json.dump([], write_file, indent = 2)
-            return self.load_fingerprintDB()
-    
-    def save_fingerprintDB(self):
-        with open(rf"data/hashes/hash_{self.name}.json", 'w') as write_file:
-            json.dump(self.fingerprintDB, write_file, indent = 2)
-    
-    def get_hash_int(self, instr):
-        """Returns a hashed int of provided string"""
-        sha256hash = hashlib.sha256()
-        sha256hash.update(instr.encode('utf8'))
-        hash_id = sha256hash.hexdigest()
-        hash_ = int(hash_id,16)
-        return hash_
-
-    def is_unique_fingerprint(self, string, database_list=None):
-        """Compares hash to provided database_list"""
-        fingerprint = self.get_hash_int(string)
-        length = 100
-
-        # Catch to set to own fingerprintdb
-        if database_list == None:
-            if self.fingerprintDB == None:
-                return True
-            database_list = self.fingerprintDB
+            self.load_json_fingerprintDB()
+            return
 
+        width = self.DIGEST_SIZE
+        usable = len(data) - len(data) % width
+        for start in range(max(0, usable - self.size*width), usable, width):
+            self.add(data[start:start+width])
+
+    def load_json_fingerprintDB(self):
+        """Migrates a window saved in the former json format, if any"""
+        path = rf"data/hashes/hash_{self.name}.json"
         try:
-            comparison = database_list.index(fingerprint)
-        except ValueError as v:
-            # Insert new elements to list 
-            database_list.insert(0, fingerprint)
-            # Pop elements over length to keep the list small
-            if len(database_list) > length-1: 
-                try:
-                    database_list.pop(length)
-                except IndexError:
-                    logging.error(f"Pop index out of range {string}")
+            with open(path, 'r') as read_file:
+                fingerprints = json.load(read_file)
+        except FileNotFoundError:
+            return
+        logging.info(f"Migrating {path} to {self.path}")
+
+        # Stored newest first; older files hold full 256 bit digests
+        for fingerprint in reversed(fingerprints[:self.size]):
+            width = 32 if fingerprint >> (8*self.DIGEST_SIZE) else self.DIGEST_SIZE
+            self.add(fingerprint.to_bytes(width, 'big')[:self.DIGEST_SIZE])
+        self.dirty = True
+        self.save_fingerprintDB()
+        os.remove(path)
+
+    def save_fingerprintDB(self):
+        """Atomically writes the window to disk if it changed since last save"""
+        if not self.dirty:
+            return
+        self.dirty = False
+        self.saved_at = time.monotonic()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path + '.tmp', 'wb') as write_file:
+            write_file.write(b''.join(self.get_digests()))
+        os.replace(self.path + '.tmp', self.path)
+
+    def is_due(self) -> bool:
+        """Returns: True if dirty and the save interval has passed"""
+        return self.dirty and (time.monotonic() - self.saved_at 
+            >= DB.get_fingerprint_save_interval())
+
+    def save_if_due(self):
+        if self.is_due():
             self.save_fingerprintDB()
-            return True
+
+    def get_digests(self) -> list:
+        """Returns: list of fingerprint digests in window, oldest first"""
+        width = self.DIGEST_SIZE
+        if self.count < self.size:
+            slots = range(self.count)
         else:
+            slots = list(range(self.head, self.size)) + list(range(self.head))
+        return [bytes(self.ring[i*width:(i+1)*width]) for i in slots]
+
+    def get_digest(self, instr) -> bytes:
+        """Returns: DIGEST_SIZE byte fingerprint of provided string"""
+        return hashlib.sha256(instr.encode('utf8')).digest()[:self.DIGEST_SIZE]
+
+    def add(self, digest:bytes):
+        """Writes digest over the oldest fingerprint in the window"""
+        start = self.head * self.DIGEST_SIZE
+        end = start + self.DIGEST_SIZE
+        if self.count == self.size:
+            self.members.discard(bytes(self.ring[start:end]))
+        else:
+            self.count += 1
+        self.ring[start:end] = digest
+        self.members.add(digest)
+        self.head = (self.head + 1) % self.size
+
+    def is_unique_fingerprint(self, string):
+        """Returns True and adds fingerprint if string is not in the window"""
+        fingerprint = self.get_digest(string)
+        if fingerprint in self.members:
             return False
+        self.add(fingerprint)
+        self.dirty = True
+        return True
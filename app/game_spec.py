@@ -0,0 +1,203 @@
+"""
+Module containing the compiler for declarative game log specs.
+
+A spec is a json file describing how a game's log lines become events, so new
+games can be linked without writing a parser. cogs/specgame.py turns every spec
+into a GameCog. Example:
+
+{
+  "name": "Factorio",
+  "prefix": "[",
+  "line": "^[^\\[]*(?P<entry>\\[.*)$",
+  "rules": [
+    {"type": "MSG", "pattern": "\\[CHAT\\] *(?P<user>[^:]*?) *:(?P<message>.*)$",
+     "username": "<{user}>", "color": "dark_gold"},
+    {"type": "JOIN", "pattern": "\\[JOIN\\] *(?P<user>\\S*)",
+     "message": "joined the game.", "color": "dark_gold"}
+  ]
+}
+
+The reference specs in specs/ express the Factorio and Minecraft cogs' rules.
+
+`prefix` (optional) is a substring every event line contains. `line`
+(optional) is a pattern whose `entry` group the rules are matched against,
+lines it does not match are not events. Each rule has:
+ - `type`: a MessageType name
+ - `pattern`: matched at the start of the entry, its named groups are captures
+ - `username`, `message`: str.format templates of the captures, default
+   "{user}" and "{message}"
+ - `color`: a discord.Color classmethod name or "#rrggbb", default "blue"
+ - `phrases` (optional): list of strings substituted for "{phrases}" in the
+   pattern as one alternation, longest first
+ - `since`, `until` (optional): version range the rule applies to, ie. "1.19.1"
+
+Rules are tried in order. Per server version, the rules that apply are compiled
+into one alternation, so a line is classified by a single regex match.
+
+Authors: Emmett Peck (EmmettPeck)
+Version: October 18th, 2026
+"""
+
+import json
+import logging
+import re
+
+import discord
+
+from messages import COLORS, MessageType, split_first
+
+CAPTURE = re.compile(r"\(\?P([<=])(\w+)")
+
+
+def version_number(version:str) -> tuple:
+    """
+    Returns: tuple of the numbers in a version, empty if none
+
+    version_number('Minecraft:1.19.2') --> (1, 19, 2)
+    """
+    if not version:
+        return ()
+    release = split_first(version, ':')[1] if ':' in version else version
+    return tuple(int(number) for number in re.findall(r'\d+', release))
+
+def get_color(name:str) -> discord.Color:
+    """Returns: discord.Color of a classmethod name or "#rrggbb" hex string"""
+    if name.startswith('#'):
+        return discord.Color(int(name[1:], 16))
+    return COLORS.get(name) or getattr(discord.Color, name)()
+
+
+class SpecRule:
+    """
+    A rule of a spec, see module docstring for its keys.
+    """
+
+    def __init__(self, rule:dict):
+        self.type = MessageType[rule['type']]
+        self.color = get_color(rule.get('color', 'blue'))
+        self.username = rule.get('username', '{user}')
+        self.message = rule.get('message', '{message}')
+        self.since = version_number(rule.get('since'))
+        self.until = version_number(rule.get('until'))
+
+        pattern = rule['pattern']
+        if 'phrases' in rule:
+            phrases = sorted(set(rule['phrases']), key=len, reverse=True)
+            pattern = pattern.replace('{phrases}',
+                '(?:' + '|'.join(re.escape(phrase) for phrase in phrases) + ')')
+        self.pattern = pattern
+        re.compile(pattern) # Fail on load, not on first line
+
+    def applies(self, number:tuple) -> bool:
+        """Returns: True if the rule applies to a version number"""
+        if not number:
+            return True
+        if self.since and number < self.since:
+            return False
+        if self.until and number > self.until:
+            return False
+        return True
+
+    def get_event(self, captures:dict) -> tuple:
+        """Returns: `(username, message, MessageType, discord.Color)`"""
+        return (self.username.format(**captures),
+            self.message.format(**captures), self.type, self.color)
+
+
+class SpecMatcher:
+    """
+    Rules of a spec compiled for one version into one alternation.
+
+    Each rule's pattern is wrapped in a group named by its index, and its
+    captures renamed to be unique, so the group the match ends in identifies
+    the rule.
+    """
+
+    def __init__(self, prefix:str, line, rules:list):
+        self.prefix = prefix
+        self.line = line
+        self.rules = rules
+        alternatives = []
+        for index, rule in enumerate(rules):
+            renamed = CAPTURE.sub(
+                lambda match: f"(?P{match.group(1)}r{index}_{match.group(2)}",
+                rule.pattern)
+            alternatives.append(f"(?P<r{index}>{renamed})")
+        self.pattern = re.compile('|'.join(alternatives)) if rules else None
+
+    def parse(self, message:str) -> tuple:
+        """
+        Returns: `(username, message, MessageType, discord.Color)` of an event
+        line, None if not an event
+        """
+        if self.pattern is None:
+            return None
+        if self.prefix is not None and self.prefix not in message:
+            return None
+        entry = message.rstrip()
+        if self.line is not None:
+            line = self.line.match(entry)
+            if line is None:
+                return None
+            entry = line.group('entry')
+
+        match = self.pattern.match(entry)
+        if match is None:
+            return None
+        group = match.lastgroup
+        strip = len(group) + 1
+        captures = {name[strip:]: value
+            for name, value in match.groupdict().items()
+            if value is not None and name.startswith(group + '_')}
+        return self.rules[int(group[1:])].get_event(captures)
+
+
+class GameSpec:
+    """
+    A loaded spec, compiling a SpecMatcher per version on first use.
+
+    Attributes
+    ---
+    `name` : `str`
+        -- Name of the game, the name of the cog and the version prefix of its
+        servers in containers.json ie. "Factorio"
+    `prefix` : `str`
+        -- Substring every event line contains, None if unknown
+    """
+
+    def __init__(self, spec:dict):
+        self.name = spec['name']
+        self.prefix = spec.get('prefix')
+        self.line = re.compile(spec['line']) if spec.get('line') else None
+        if self.line is not None and 'entry' not in self.line.groupindex:
+            raise ValueError(f"{self.name} spec line has no entry group")
+        self.rules = [SpecRule(rule) for rule in spec['rules']]
+        self.matchers = {}
+
+    @classmethod
+    def load(cls, path:str) -> 'GameSpec':
+        """
+        Returns: GameSpec loaded from a json file
+
+        Raises ValueError, KeyError or re.error if the spec is invalid
+        """
+        with open(path, 'r') as read_file:
+            spec = cls(json.load(read_file))
+        logging.info(f"Loaded {spec.name} spec from {path}")
+        return spec
+
+    def get_matcher(self, version:str=None) -> SpecMatcher:
+        """Returns: SpecMatcher of the rules applying to version"""
+        matcher = self.matchers.get(version)
+        if matcher is None:
+            number = version_number(version)
+            matcher = self.matchers[version] = SpecMatcher(self.prefix,
+                self.line, [rule for rule in self.rules if rule.applies(number)])
+        return matcher
+
+    def parse(self, message:str, version:str=None) -> tuple:
+        """
+        Returns: `(username, message, MessageType, discord.Color)` of an event
+        line of a server of version, None if not an event
+        """
+        return self.get_matcher(version).parse(message)
@@ -0,0 +1,90 @@
+"""
+Module containing the manager of a linked channel's header (topic).
+
+Discord allows 2 topic edits per 10 minutes per channel, while joins, leaves
+and status changes want the header updated far more often. A HeaderManager
+keeps one background task per server which, once an update is requested,
+waits a short debounce and for the rate window to allow an edit, then renders
+the current header once for every request made meanwhile. A header matching
+the channel's current topic is not edited, and spends none of the window.
+
+Authors: Emmett Peck (EmmettPeck)
+Version: October 18th, 2026
+"""
+
+import asyncio
+import logging
+
+from outbox import RateBucket
+
+
+class HeaderManager:
+    """
+    Coalesces header update requests of a server into rate-limited edits.
+
+    Attributes
+    ---
+    `name` : `str`
+        -- Name of the server, used in logging
+    `topic` : `str`
+        -- Header last set, None if unknown
+    `debounce` : `float`
+        -- Seconds requests are gathered before rendering
+    `bucket` : `RateBucket`
+        -- Topic edit rate limit of the channel
+    """
+
+    def __init__(self, name:str, rate:tuple, debounce:float):
+        self.name = name
+        self.topic = None
+        self.debounce = debounce
+        self.bucket = RateBucket(*rate)
+        self.requested = None
+        self.task = None
+
+    def is_running(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    def start(self, render, apply):
+        """
+        Starts the manager's task, if not running.
+
+        Parameters:
+        ---
+        `render` : `coroutine function`
+            -- Returns the header as it should be now
+        `apply` : `coroutine function`
+            -- Sets the header to its one argument, returning False if it was
+            not edited, ie. already set or the channel is unavailable
+        """
+        if self.is_running():
+            return
+        self.requested = asyncio.Event()
+        self.task = asyncio.ensure_future(self.run(render, apply))
+
+    def request(self):
+        """Requests an update, coalesced with others pending"""
+        if self.requested is not None:
+            self.requested.set()
+
+    def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+        self.task = None
+
+    async def run(self, render, apply):
+        """Renders and applies requested headers until stopped"""
+        while True:
+            await self.requested.wait()
+            await asyncio.sleep(self.debounce)
+            await self.bucket.wait()
+            self.requested.clear()
+            try:
+                topic = await render()
+                # apply skips headers already set, sparing the window
+                if await apply(topic):
+                    self.bucket.record()
+                    self.topic = topic
+                    logging.info(f"Updated Header {self.name}")
+            except Exception as e:
+                logging.warning(f"{self.name} header update failed: {e}")
@@ -0,0 +1,101 @@
+"""
+Module containing the optional process-isolated log ingestion worker.
+
+With DB.INGEST_PROCESSES above 0, fingerprinting and parsing of drained log
+lines for every GameCog runs in a small pool of worker processes instead of the
+process serving the discord gateway, so CPU heavy bursts (ie. a crash dumping
+thousands of stacktrace lines) can not starve it. Each server is pinned to one
+worker, which owns that server's FingerPrints. Workers send back compact
+`(nanos, username, message, type, color)` tuples of plain values.
+
+Authors: Emmett Peck (EmmettPeck)
+Version: October 18th, 2026
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import logging
+import multiprocessing
+import threading
+import zlib
+
+from database import DB, singleton
+from fingerprints import FingerPrints
+
+# Worker-side FingerPrints by docker_name, owned by the worker process
+fingerprints = {}
+
+def parse_lines(docker_name:str, parser, version:str, lines:list) -> list:
+    """
+    Returns: list of compact event tuples parsed from unique lines.
+    Run inside a worker process.
+
+    Parameters:
+    ---
+    `docker_name` : `str`
+        -- Name of the server's container, keys its fingerprints
+    `parser` : `function`
+        -- The GameCog's parse_batch(lines, version, fingerprint)
+    `version` : `str`
+        -- Version of the server
+    `lines` : `list`
+        -- `(nanos, line)` tuples to parse
+    """
+    fingerprint = fingerprints.get(docker_name)
+    if fingerprint is None:
+        fingerprint = fingerprints[docker_name] = FingerPrints(docker_name)
+
+    events = [(nanos, username, message, mtype.value, color.value, *cause)
+        for nanos, username, message, mtype, color, *cause
+        in parser(lines, version, fingerprint)]
+    fingerprint.save_if_due()
+    return events
+
+def save_fingerprints():
+    """Saves every dirty FingerPrints of a worker process"""
+    for fingerprint in fingerprints.values():
+        fingerprint.save_fingerprintDB()
+
+@singleton
+class IngestWorkers:
+    """
+    A singleton pool of single-process executors, started on first use.
+    """
+    def __init__(self):
+        self.pools = []
+        self.lock = threading.Lock()
+
+    def enabled(self) -> bool:
+        return DB.get_ingest_processes() > 0
+
+    def get_pool(self, docker_name:str) -> ProcessPoolExecutor:
+        """Returns: the worker docker_name is pinned to"""
+        with self.lock:
+            if not self.pools:
+                # Spawn, as forking a process with running threads is unsafe
+                context = multiprocessing.get_context('spawn')
+                self.pools = [
+                    ProcessPoolExecutor(max_workers=1, mp_context=context)
+                    for i in range(DB.get_ingest_processes())]
+                logging.info(f"Started {len(self.pools)} ingestion workers")
+        return self.pools[zlib.crc32(docker_name.encode()) % len(self.pools)]
+
+    def parse(self, docker_name:str, parser, version:str, lines:list) -> list:
+        """
+        Returns: compact events of lines parsed by docker_name's worker.
+        Blocks until parsed, call from an Executor thread.
+        """
+        return self.get_pool(docker_name).submit(
+            parse_lines, docker_name, parser, version, lines).result()
+
+    def flush(self):
+        """Saves the fingerprints held by every worker, blocking until saved"""
+        with self.lock:
+            futures = [pool.submit(save_fingerprints) for pool in self.pools]
+        for future in futures:
+            future.result()
+
+    def shutdown(self):
+        with self.lock:
+            for pool in self.pools:
+                pool.shutdown(wait=False)
+            self.pools = []
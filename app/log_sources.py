@@ -0,0 +1,433 @@
+"""
+Module containing log ingestion sources for gamecog servers.
+
+A log source holds one long-lived connection to a server's log output and
+buffers new lines as they arrive, so GameCog.read only has to drain what is new
+instead of re-tailing the container every interval. Every source drains
+`(nanos, position, line)` tuples and persists the position of lines handed back
+through commit(), so ingestion resumes exactly where it left off after a
+restart.
+
+Sources are selected per containers.json entry by make_log_source():
+    "log_source": "docker"  -- (default) DockerLogFollower, docker log stream
+    "log_source": "file"    -- LogFileTailer of "log_path" on a mounted volume
+
+Authors: Emmett Peck (EmmettPeck)
+Version: October 18th, 2026
+"""
+
+import calendar
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timedelta
+
+from database import DB
+
+NANOS = 10**9
+
+# Timestamps ------------------------------------------------------------------
+def parse_timestamp(stamp:str) -> int:
+    """
+    Returns: nanoseconds since epoch of a docker RFC3339Nano timestamp
+
+    Docker trims trailing zeros from the fraction, so it is padded back out.
+    parse_timestamp('2022-05-27T12:34:56.5Z') --> 1653654896500000000
+    Raises ValueError if stamp is not a timestamp.
+    """
+    stamp = stamp.rstrip('Z')
+    seconds, _, fraction = stamp.partition('.')
+    whole = calendar.timegm(time.strptime(seconds, '%Y-%m-%dT%H:%M:%S'))
+    if not fraction.isdigit() and fraction != '':
+        raise ValueError(f"Invalid timestamp fraction {stamp}")
+    return whole*NANOS + int(fraction[:9].ljust(9, '0'))
+
+def nanos_to_datetime(nanos:int) -> datetime:
+    """Returns: local naive datetime of nanoseconds since epoch"""
+    return (datetime.fromtimestamp(nanos // NANOS)
+        + timedelta(microseconds=(nanos % NANOS) // 1000))
+
+# Cursor ----------------------------------------------------------------------
+class LogCursor:
+    """
+    Position of the last ingested log line of a container.
+
+    The position is the docker timestamp of the line in nanoseconds plus its
+    sequence number among lines sharing that timestamp. Saved to
+    data/cursors/cursor_{docker_name}.json alongside the container id it
+    belongs to.
+
+    Attributes
+    ---
+    `name` : `str`
+        -- Docker name of the container
+    `container_id` : `str`
+        -- Id of the container the position was taken from
+    `nanos` : `int`
+        -- Timestamp of the last ingested line, None if never ingested
+    `sequence` : `int`
+        -- Count of ingested lines with timestamp `nanos`
+    """
+
+    def __init__(self, docker_name:str):
+        self.name = docker_name
+        self.container_id = None
+        self.nanos = None
+        self.sequence = 0
+        self.load_cursor()
+
+    def get_path(self) -> str:
+        return rf"data/cursors/cursor_{self.name}.json"
+
+    def load_cursor(self):
+        try:
+            with open(self.get_path(), 'r') as read_file:
+                cursor = json.load(read_file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            logging.info(f"No log cursor for {self.name}, starting from now")
+            return
+        self.container_id = cursor.get('container_id')
+        self.nanos = cursor.get('nanos')
+        self.sequence = cursor.get('sequence', 0)
+
+    def save_cursor(self):
+        os.makedirs(os.path.dirname(self.get_path()), exist_ok=True)
+        with open(self.get_path(), 'w') as write_file:
+            json.dump({
+                'container_id': self.container_id,
+                'nanos': self.nanos,
+                'sequence': self.sequence}, write_file, indent = 2)
+
+    def advance(self, container_id:str, nanos:int, sequence:int):
+        """Moves cursor to an ingested line, saving it"""
+        self.container_id = container_id
+        self.nanos = nanos
+        self.sequence = sequence
+        self.save_cursor()
+
+# Sources ---------------------------------------------------------------------
+def make_log_source(container:dict):
+    """
+    Returns: Log source configured by a containers.json entry
+
+    Parameters:
+    ---
+    `container` : `dict`
+        -- containers.json entry, selects source with "log_source"
+    """
+    docker_name = container.get('docker_name')
+    kind = container.get('log_source', 'docker')
+    if kind == 'file':
+        return LogFileTailer(docker_name, container.get('log_path'))
+    elif kind != 'docker':
+        logging.error(f"{docker_name} unknown log_source {kind}, using docker")
+    return DockerLogFollower(docker_name, LogCursor(docker_name))
+
+def drain_queue(lines:queue.Queue) -> list:
+    """Returns: list of every item in lines, emptying it"""
+    drained = []
+    try:
+        while True:
+            drained.append(lines.get_nowait())
+    except queue.Empty:
+        return drained
+
+class DockerLogFollower:
+    """
+    Follows the timestamped docker logs of a container from a background thread
+
+    Holds a single `container.logs(stream=True, follow=True)` stream open,
+    splitting the streamed chunks into lines and buffering them until drained
+    as `(nanos, sequence, line)` tuples. Each (re)connect resumes from the
+    second of the cursor, skipping lines at or before the cursor position.
+
+    The position resets when the container was recreated (new container id)
+    or the cursor lies in the future, as after a clock change or log rotation
+    on a fresh daemon.
+
+    Attributes
+    ---
+    `docker_name` : `str`
+        -- Name of the container to follow
+    `cursor` : `LogCursor`
+        -- Persisted position ingestion is resumed from
+    `lines` : `queue.Queue`
+        -- Lines received but not yet drained
+    `on_line` : `callable`
+        -- Called from the follower thread when new lines are buffered
+    """
+    RETRY_MIN = 1   # Seconds before first reconnect attempt
+    RETRY_MAX = 30  # Ceiling of reconnect backoff
+
+    def __init__(self, docker_name:str, cursor:LogCursor):
+        self.docker_name = docker_name
+        self.cursor = cursor
+        self.lines = queue.Queue()
+        self.on_line = None
+        self.container_id = cursor.container_id
+        self.nanos = cursor.nanos
+        self.sequence = cursor.sequence
+        self.running = False
+        self._stream = None
+        self._thread = None
+
+    def start(self):
+        """Starts following logs in a daemon thread, if not already running"""
+        if self.running:
+            return
+        self.running = True
+        self._thread = threading.Thread(
+            target=self._follow,
+            name=f"follow-{self.docker_name}",
+            daemon=True)
+        self._thread.start()
+        logging.info(f"Started log follower for {self.docker_name}")
+
+    def stop(self):
+        """Stops following, closing the open stream to unblock the thread"""
+        self.running = False
+        if self._stream is not None:
+            try:
+                self._stream.close()
+            except Exception as e:
+                logging.warning(f"{self.docker_name} follower close raised {e}")
+        logging.info(f"Stopped log follower for {self.docker_name}")
+
+    def drain(self) -> list:
+        """Returns: list of `(nanos, sequence, line)` received since last drain"""
+        return drain_queue(self.lines)
+
+    def commit(self, nanos:int, sequence:int):
+        """Moves the persisted cursor to an ingested line"""
+        self.cursor.advance(
+            container_id=self.container_id, nanos=nanos, sequence=sequence)
+
+    def _follow(self):
+        """Thread target; streams logs into self.lines until stopped"""
+        retry = self.RETRY_MIN
+        while self.running:
+            try:
+                container = DB.client.containers.get(self.docker_name)
+                self._reposition(container.id)
+                self._stream = container.logs(stream=True, follow=True,
+                    timestamps=True, since=self.nanos // NANOS)
+                retry = self.RETRY_MIN
+                self._consume(self._stream)
+            except Exception as e:
+                logging.warning(
+                    f"{self.docker_name} log stream failed: {e}, "
+                    f"retrying in {retry}s")
+            finally:
+                self._stream = None
+
+            # Stream ended or failed, wait before reconnecting
+            if self.running:
+                time.sleep(retry)
+                retry = min(retry*2, self.RETRY_MAX)
+
+    def _reposition(self, container_id:str):
+        """Resets the position if it can not be resumed in container_id"""
+        now = time.time_ns()
+        if self.nanos is None or self.nanos > now + NANOS:
+            logging.info(f"{self.docker_name} cursor reset to now")
+            self.nanos, self.sequence = now, 0
+        elif self.container_id and self.container_id != container_id:
+            logging.warning(f"{self.docker_name} container was recreated, "
+                "resetting cursor sequence")
+            self.sequence = 0
+        self.container_id = container_id
+
+    def _consume(self, stream):
+        """Splits streamed byte chunks into lines, buffering partial lines"""
+        replayed = 0 # Lines seen this stream with timestamp self.nanos
+        partial = ""
+        for chunk in stream:
+            if not self.running:
+                return
+            partial += chunk.decode(encoding="utf-8", errors="ignore")
+            *complete, partial = partial.split('\n')
+            for line in complete:
+                stamp, _, text = line.partition(' ')
+                try:
+                    nanos = parse_timestamp(stamp)
+                except ValueError:
+                    logging.warning(f"{self.docker_name} untimed line {line}")
+                    continue
+
+                # Skip lines at or before the position
+                if nanos < self.nanos:
+                    continue
+                elif nanos == self.nanos:
+                    replayed += 1
+                    if replayed <= self.sequence:
+                        continue
+                    self.sequence += 1
+                else:
+                    self.nanos, self.sequence, replayed = nanos, 1, 1
+
+                if text.strip():
+                    self.lines.put((nanos, self.sequence, text))
+            if complete and self.on_line:
+                self.on_line()
+
+
+class LogFileTailer:
+    """
+    Tails a server log file on a mounted volume from a background thread.
+
+    Polls the file every POLL seconds, reading everything new in CHUNK sized
+    buffered reads and draining complete lines as `(nanos, (inode, offset),
+    line)` tuples, where offset is the byte just past the line. Committed
+    positions are saved to data/offsets/offset_{docker_name}.json.
+
+    Rotation is detected by a changed inode (file replaced, the old one is read
+    to its end first) or a size below the read position (truncated in place);
+    either way the new file is read from its start.
+
+    Attributes
+    ---
+    `docker_name` : `str`
+        -- Name of the container the log belongs to
+    `path` : `str`
+        -- Path of the log file, ie. /mnt/mc/logs/latest.log
+    `state_path` : `str`
+        -- Path the committed position is saved to
+    `lines` : `queue.Queue`
+        -- Lines read but not yet drained
+    `on_line` : `callable`
+        -- Called from the tailer thread when new lines are buffered
+    """
+    POLL = 0.5          # Seconds between checks for new data
+    CHUNK = 1 << 20     # Bytes per read
+
+    def __init__(self, docker_name:str, path:str, state_path:str=None):
+        self.docker_name = docker_name
+        self.path = path
+        self.state_path = (state_path if state_path 
+            else rf"data/offsets/offset_{docker_name}.json")
+        self.lines = queue.Queue()
+        self.on_line = None
+        self.saved_inode, self.saved_offset = self.load_offset()
+        self.running = False
+        self._file = None
+        self._inode = None
+        self._position = 0
+        self._partial = b""
+        self._thread = None
+
+    def load_offset(self) -> tuple:
+        """Returns: `(inode, offset)` saved at state_path, `(None, 0)` if none"""
+        try:
+            with open(self.state_path, 'r') as read_file:
+                state = json.load(read_file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            logging.info(f"No log offset for {self.docker_name}, tailing from end")
+            return None, 0
+        return state.get('inode'), state.get('offset', 0)
+
+    def save_offset(self):
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        with open(self.state_path, 'w') as write_file:
+            json.dump({'inode': self.saved_inode, 'offset': self.saved_offset},
+                write_file, indent = 2)
+
+    def start(self):
+        """Starts tailing the file in a daemon thread, if not already running"""
+        if self.running:
+            return
+        self.running = True
+        self._thread = threading.Thread(
+            target=self._tail,
+            name=f"tail-{self.docker_name}",
+            daemon=True)
+        self._thread.start()
+        logging.info(f"Started log tailer for {self.docker_name} {self.path}")
+
+    def stop(self):
+        self.running = False
+        logging.info(f"Stopped log tailer for {self.docker_name}")
+
+    def drain(self) -> list:
+        """Returns: list of `(nanos, (inode, offset), line)` since last drain"""
+        return drain_queue(self.lines)
+
+    def commit(self, nanos:int, position:tuple):
+        """Saves the position just past an ingested line"""
+        self.saved_inode, self.saved_offset = position
+        self.save_offset()
+
+    def _tail(self):
+        """Thread target; polls the file into self.lines until stopped"""
+        while self.running:
+            try:
+                self.poll()
+            except OSError as e:
+                logging.warning(f"{self.docker_name} tailing {self.path} "
+                    f"failed: {e}")
+                self._close()
+            time.sleep(self.POLL)
+        self._close()
+
+    def poll(self):
+        """Reads any new data of the file, following rotation"""
+        stat = os.stat(self.path)
+        if self._file is None:
+            self._open(stat)
+        elif stat.st_ino != self._inode:
+            # Replaced, finish the old file then start the new one
+            logging.info(f"{self.docker_name} {self.path} rotated")
+            self._read_available()
+            self._close()
+            self._open(stat)
+        elif stat.st_size < self._position:
+            logging.info(f"{self.docker_name} {self.path} truncated")
+            self._seek(0)
+        self._read_available()
+
+    def _open(self, stat):
+        """Opens the file, resuming the last position if it is the same file"""
+        if self._inode is not None:
+            inode, offset = self._inode, self._position
+        elif self.saved_inode is not None:
+            inode, offset = self.saved_inode, self.saved_offset
+        else:
+            # Never tailed before, start from the end
+            inode, offset = stat.st_ino, stat.st_size
+
+        self._file = open(self.path, 'rb')
+        self._inode = stat.st_ino
+        if inode == stat.st_ino and offset <= stat.st_size:
+            self._seek(offset)
+        else:
+            self._seek(0)
+
+    def _seek(self, offset:int):
+        self._file.seek(offset)
+        self._position = offset
+        self._partial = b""
+
+    def _close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _read_available(self):
+        """Reads to the end of file, queueing each complete line"""
+        added = False
+        while True:
+            data = self._file.read(self.CHUNK)
+            if not data:
+                break
+            nanos = time.time_ns()
+            *complete, self._partial = (self._partial + data).split(b'\n')
+            for raw in complete:
+                self._position += len(raw) + 1
+                line = raw.decode(encoding="utf-8", errors="ignore").rstrip('\r')
+                if line.strip():
+                    self.lines.put((nanos, (self._inode, self._position), line))
+                    added = True
+        if added and self.on_line:
+            self.on_line()
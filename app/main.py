@@ -28,4 +28,5 @@ if __name__ == '__main__': # Load cogs listed in extensions
         bot.load_extension(extension)
         logging.debug(f"loaded {extension}")
 
-bot.run(os.getenv('TOKEN'),bot=True, reconnect=True)
\ No newline at end of file
+    # Guarded, as spawned ingestion workers re-import this module
+    bot.run(os.getenv('TOKEN'),bot=True, reconnect=True)
\ No newline at end of file
@@ -1,9 +1,10 @@
 """
 messages.py
 By: Emmett Peck
-Message filtering and dictionary building from serverlogs for various MC versions/games
+Message filtering and event records from serverlogs for various MC versions/games
 """
 import logging
+import sys
 import discord
 from enum import Enum
 from datetime import datetime
@@ -12,25 +13,15 @@ from database import DB
 def split_first(split_str, character) -> tuple:
     """Splits by first instance of character. split_first('Hi[Emmett]','[') --> ['Hi','Emmett]']"""
     index = split_str.find(character)
-    before, after = "",""
-    for i in range(len(split_str)):
-        if i < index:
-            before += split_str[i]
-        if i > index:
-            after += split_str[i]
-
-    return before, after
+    return split_str[:max(index, 0)], split_str[index+1:]
 
 def get_between(in_str, beginning_char, end_char) -> str:
     '''Gets text between first instance of beginning_char and first instance of end_char'''
-    string = ""
     middle = split_first(in_str,beginning_char)[1]
-    for i in range(len(middle)):
-        if middle[i] == end_char:
-            return string
-        else:
-            string += middle[i]
-    return None
+    end = middle.find(end_char)
+    if end == -1:
+        return None
+    return middle[:end]
 
 class MessageType(Enum):
     MSG = 1
@@ -53,8 +44,49 @@ def get_type_icon(type):
         type_uni = ""
     return type_uni
 
-def get_msg_dict(username, message, MessageType, color):
-        """Appends and prints messages to return_list as dictionaries"""
-        local_dict = {"username":username, "message": message, "type": MessageType, "time": datetime.now(), 'color': color}
-        logging.info(f'"{username} {message}" {MessageType}')
-        return local_dict
\ No newline at end of file
+# Static colour table, parsers share these instead of building a Color per line
+COLORS = {name: getattr(discord.Color, name)() for name in ('blue', 'green',
+    'gold', 'dark_gold', 'dark_teal', 'dark_purple', 'red')}
+
+class Event:
+    """
+    A parsed log event, passed through a server's connect & message queues.
+
+    Attributes
+    ---
+    `username` : `str`
+        -- Player the event is from, interned as the same few names repeat
+    `message` : `str`
+        -- Text of the event
+    `type` : `MessageType`
+        -- Kind of event
+    `color` : `int`
+        -- Embed colour value
+    `time` : `datetime`
+        -- Time the event was logged, defaults to now
+    `server` : `str`
+        -- Name of the server, set when routed to a connect_queue
+    `cause` : `str`
+        -- Death phrase of a death parsed with one, ie. "was slain by"
+    """
+    __slots__ = ('username', 'message', 'type', 'color', 'time', 'server',
+        'cause')
+
+    def __init__(self, username:str, message:str, type:MessageType, color,
+        time:datetime=None, server:str=None, cause:str=None):
+        self.username = sys.intern(username)
+        self.message = message
+        self.type = type
+        self.color = getattr(color, 'value', color)
+        self.time = time if time else datetime.now()
+        self.server = server
+        self.cause = cause
+        logging.debug('"%s %s" %s', username, message, type)
+
+    def is_connect(self) -> bool:
+        """Returns: True if a join or leave"""
+        return self.type is MessageType.JOIN or self.type is MessageType.LEAVE
+
+    def __repr__(self):
+        return (f"Event({self.username!r}, {self.message!r}, {self.type}, "
+            f"{self.color:#08x}, {self.time!r}, {self.server!r})")
@@ -0,0 +1,221 @@
+"""
+Module containing precompiled Minecraft log grammars by server flavour & version.
+
+A grammar first rejects lines on a cheap substring test of its INFO prefix,
+then pulls the entry out of the line with one compiled pattern, and dispatches
+the entry on its first character to compiled event patterns. Grammars are
+selected from the containers.json version, ie. "Minecraft:1.19" (vanilla) or
+"Minecraft:paper-1.19" (Paper/Spigot/Purpur).
+
+Authors: Emmett Peck (EmmettPeck)
+Version: October 18th, 2026
+"""
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+from messages import COLORS, MessageType, split_first
+
+# Line layouts -----------------------------------------------------------------
+# Vanilla: [12:34:56] [Server thread/INFO]: Steve joined the game
+VANILLA_LINE = r"^\[\d\d:\d\d:\d\d\] \[Server thread/INFO\]: (?P<entry>.*)$"
+# Paper console: [12:34:56 INFO]: Steve joined the game, plus vanilla layout
+# lines of the server & async chat threads
+PAPER_LINE = (r"^\[\d\d:\d\d:\d\d(?: INFO\]|\] \[(?:Server thread|Async Chat "
+    r"Thread - #\d+)/INFO\]): (?P<entry>.*)$")
+
+# Entries ----------------------------------------------------------------------
+CHAT = r"^<(?P<user>[^>]+)> (?P<message>.*)$"
+# 1.19.1+ marks unsigned chat
+CHAT_SIGNED = r"^(?:\[Not Secure\] )?<(?P<user>[^>]+)> (?P<message>.*)$"
+JOIN = r"^(?P<user>\S+)(?: \(formerly known as \S+\))? joined the game$"
+LEAVE = r"^(?P<user>\S+) left the game$"
+ADVANCEMENT = (r"^(?P<user>\S+) has (?P<kind>made the advancement|reached the "
+    r"goal|completed the challenge) (?P<name>\[.*\])$")
+
+
+class Grammar:
+    """
+    Compiled grammar of one Minecraft server flavour & version range.
+
+    Attributes
+    ---
+    `name` : `str`
+        -- Name used in logging, ie. "vanilla-1.19.1"
+    `prefix` : `str`
+        -- Substring every event line contains, tested before any pattern
+    `death` : `DeathMatcher`
+        -- Death phrases of the version
+    """
+
+    def __init__(self, name:str, prefix:str, line:str, chat:str,
+        death:'DeathMatcher'):
+        self.name = name
+        self.prefix = prefix
+        self.line = re.compile(line)
+        self.chat = re.compile(chat)
+        self.join = re.compile(JOIN)
+        self.leave = re.compile(LEAVE)
+        self.advancement = re.compile(ADVANCEMENT)
+        self.death = death
+
+    def parse(self, line:str) -> tuple:
+        """
+        Returns: `(username, message, MessageType, discord.Color)` of an event
+        line, with the matched death phrase appended for deaths, None if not
+        an event
+        """
+        if self.prefix not in line:
+            return None
+        match = self.line.match(line.rstrip())
+        if match is None:
+            return None
+        entry = match.group('entry')
+        if not entry:
+            return None
+
+        # Chat, including 1.19.1+ [Not Secure] chat
+        if entry[0] == '<' or entry[0] == '[':
+            chat = self.chat.match(entry)
+            if chat:
+                return (f"<{chat.group('user')}>", chat.group('message'),
+                    MessageType.MSG, COLORS['green'])
+            return None
+
+        # Connect events end with "the game"
+        if entry.endswith(" the game"):
+            join = self.join.match(entry)
+            if join:
+                return (join.group('user'), "joined the game",
+                    MessageType.JOIN, COLORS['dark_teal'])
+            leave = self.leave.match(entry)
+            if leave:
+                return (leave.group('user'), "left the game",
+                    MessageType.LEAVE, COLORS['dark_teal'])
+
+        # Advancements, goals & challenges end with their [name]
+        if entry[-1] == ']':
+            advancement = self.advancement.match(entry)
+            if advancement:
+                kind = advancement.group('kind')
+                color = (COLORS['dark_purple']
+                    if kind == "completed the challenge"
+                    else COLORS['gold'])
+                return (advancement.group('user'),
+                    f"has {kind} {advancement.group('name')}",
+                    MessageType.ACHIEVEMENT, color)
+
+        # Deaths
+        death = self.death.match(entry)
+        if death:
+            return (death.user, death.message, MessageType.DEATH, COLORS['red'],
+                death.cause)
+        return None
+
+
+# Deaths -----------------------------------------------------------------------
+# Vanilla death messages are "<player> <phrase>[ <killer/item>]"
+DEATH_PHRASES = ("was shot by", "was pummeled by", "was pricked to death",
+    "walked into a cactus whilst trying to escape", "drowned",
+    "drowned whilst trying to escape", "experienced kinetic energy",
+    "experienced kinetic energy whilst trying to escape", "blew up",
+    "was blown up by", "was killed by", "hit the ground too hard",
+    "fell from a high place", "fell off a ladder", "fell off some vines",
+    "fell off some weeping vines", "fell off some twisting vines",
+    "fell off scaffolding", "fell while climbing",
+    "was squashed by a falling anvil", "was squashed by a falling block",
+    "went up in flames", "burned to death", "was burnt to a crisp whilst fighting",
+    "went off with a bang", "tried to swim in lava", "was struck by lightning",
+    "discovered the floor was lava", "walked into danger zone due to",
+    "was killed by magic", "was slain by", "was fireballed by",
+    "was stung to death", "was stung to death by", "was shot by a skull from",
+    "starved to death", "suffocated in a wall", "was squished too much",
+    "was squashed by", "was poked to death by a sweet berry bush",
+    "was killed trying to hurt", "was impaled by", "fell out of the world",
+    "didn't want to live in the same world as", "withered away",
+    "died from dehydration", "died", "was roasted in dragon breath",
+    "was doomed to fall", "fell too far and was finished by",
+    "was killed by even more magic", "was too soft for this world")
+
+# Phrases added by later versions, by first version
+DEATH_PHRASES_SINCE = {
+    (1, 17): ("was impaled on a stalagmite", "was skewered by a falling stalactite",
+        "froze to death", "was frozen to death by"),
+    (1, 19): ("was obliterated by a sonically-charged shriek",),
+}
+
+DeathMatch = namedtuple('DeathMatch', ['user', 'cause', 'message'])
+DeathMatch.__doc__ = """
+    A matched death message.
+    DeathMatch('Steve', 'was slain by', 'was slain by Zombie')
+    """
+
+class DeathMatcher:
+    """
+    Matches death messages against a set of phrases in a single pass.
+
+    Phrases are grouped by their first word, each group compiled into one
+    alternation ordered longest first. A line is rejected with one dictionary
+    lookup of the word after the player name unless some phrase starts with it.
+    """
+
+    def __init__(self, phrases):
+        self.phrases = tuple(sorted(set(phrases), key=len, reverse=True))
+        groups = {}
+        for phrase in self.phrases:
+            groups.setdefault(phrase.split(' ', 1)[0], []).append(re.escape(phrase))
+        self.patterns = {word: re.compile('|'.join(group))
+            for word, group in groups.items()}
+
+    def extend(self, phrases) -> 'DeathMatcher':
+        """Returns: new DeathMatcher with additional phrases"""
+        return DeathMatcher(self.phrases + tuple(phrases))
+
+    def match(self, entry:str) -> DeathMatch:
+        """Returns: `DeathMatch` of a log entry, None if not a death"""
+        user, _, message = entry.strip().partition(' ')
+        pattern = self.patterns.get(message.partition(' ')[0])
+        if pattern is None:
+            return None
+        cause = pattern.match(message)
+        if cause is None:
+            return None
+        return DeathMatch(user, cause.group(), message)
+
+VANILLA_DEATHS = DeathMatcher(DEATH_PHRASES)
+
+@lru_cache(maxsize=None)
+def get_death_matcher(number:tuple) -> DeathMatcher:
+    """Returns: DeathMatcher of a version number, ie. (1, 19, 2)"""
+    phrases = [phrase for since, added in DEATH_PHRASES_SINCE.items()
+        if number >= since for phrase in added]
+    return VANILLA_DEATHS.extend(phrases) if phrases else VANILLA_DEATHS
+
+def parse_version(version:str) -> tuple:
+    """
+    Returns: `(flavour, (major, minor, patch))` of a containers.json version
+
+    parse_version('Minecraft:paper-1.19.2') --> ('paper', (1, 19, 2))
+    Unknown numbers default to the newest grammar.
+    """
+    release = split_first(version, ':')[1].strip().lower() if version else ''
+    flavour = 'vanilla'
+    for name in ('paper', 'spigot', 'purpur'):
+        if release.startswith(name):
+            flavour = 'paper'
+            release = release[len(name):].lstrip('-_ ')
+    numbers = re.findall(r'\d+', release)
+    if not numbers:
+        return flavour, (99,)
+    return flavour, tuple(int(number) for number in numbers[:3])
+
+@lru_cache(maxsize=None)
+def get_grammar(version:str) -> Grammar:
+    """Returns: compiled Grammar for a containers.json version, built once"""
+    flavour, number = parse_version(version)
+    name = f"{flavour}-{'.'.join(str(part) for part in number)}"
+    chat = CHAT_SIGNED if number >= (1, 19, 1) else CHAT
+    death = get_death_matcher(number)
+    if flavour == 'paper':
+        return Grammar(name, "INFO]: ", PAPER_LINE, chat, death)
+    return Grammar(name, "] [Server thread/INFO]: ", VANILLA_LINE, chat, death)
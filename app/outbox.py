@@ -0,0 +1,137 @@
+"""
+Module containing the outbound scheduler of game events relayed to discord.
+
+Every server queues its events in an Outbox of bounded priority lanes; joins
+and leaves first, then deaths and achievements, then chat. A single relay task
+per server takes a message's worth of events at a time, highest lane first,
+and sends them no faster than the channel's rate limit allows.
+
+A lane that is full applies the overflow policy to new events:
+ - "collapse": the new event is dropped
+ - "drop_oldest": the lane's oldest event is dropped for the new one
+Either way the dropped events are counted, and once the lane is drained a
+single "+N more" notice is sent in their place, so a spam bot or crash loop
+costs a bounded amount of memory and a few seconds of relay, not minutes.
+
+Authors: Emmett Peck (EmmettPeck)
+Version: October 18th, 2026
+"""
+
+import asyncio
+from collections import deque
+import threading
+
+from messages import COLORS, Event, MessageType
+
+# Lane names in priority order, and the events each holds
+LANES = (
+    ('connect', (MessageType.JOIN, MessageType.LEAVE)),
+    ('event', (MessageType.DEATH, MessageType.ACHIEVEMENT)),
+    ('chat', (MessageType.MSG,)),
+)
+LANE_OF = {mtype: name for name, mtypes in LANES for mtype in mtypes}
+OVERFLOW_POLICIES = ('collapse', 'drop_oldest')
+
+
+class RateBucket:
+    """
+    A sliding window of the last `limit` sends, holding a send while `limit`
+    sends were made within the last `per` seconds.
+
+    Discord allows a bot 5 messages per 5 seconds in a channel; pacing to that
+    window sends at the maximum rate without being answered with 429s.
+    """
+
+    def __init__(self, limit:int, per:float):
+        self.limit = limit
+        self.per = per
+        self.sent = deque(maxlen=limit)
+
+    async def acquire(self):
+        """Waits until a send is allowed, then counts it"""
+        await self.wait()
+        self.record()
+
+    async def wait(self):
+        """Waits until a send is allowed, without counting one"""
+        if len(self.sent) == self.limit:
+            wait = self.sent[0] + self.per - asyncio.get_event_loop().time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+    def record(self):
+        """Counts a send made now"""
+        self.sent.append(asyncio.get_event_loop().time())
+
+
+class Outbox:
+    """
+    Bounded priority lanes of a server's events awaiting relay.
+
+    Events are put from the ingestion thread and taken by the relay task, so
+    lane access is locked.
+
+    Attributes
+    ---
+    `limits` : `dict`
+        -- Events each lane holds at most, by lane name
+    `overflow` : `str`
+        -- Overflow policy, one of OVERFLOW_POLICIES
+    `bucket` : `RateBucket`
+        -- Rate limit of the linked channel
+    `dropped` : `dict`
+        -- Events dropped since the lane was last drained, by lane name
+    """
+
+    def __init__(self, limits:dict, overflow:str, rate:tuple):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy {overflow}")
+        self.limits = limits
+        self.overflow = overflow
+        self.bucket = RateBucket(*rate)
+        self.lanes = {name: deque() for name, mtypes in LANES}
+        self.dropped = {name: 0 for name, mtypes in LANES}
+        self.lock = threading.Lock()
+
+    def put(self, event:Event):
+        """Queues event in its lane, applying the overflow policy if full"""
+        name = LANE_OF[event.type]
+        lane = self.lanes[name]
+        with self.lock:
+            if len(lane) < self.limits[name]:
+                lane.append(event)
+                return
+            self.dropped[name] += 1
+            if self.overflow == 'drop_oldest':
+                lane.popleft()
+                lane.append(event)
+
+    def take(self, count:int) -> tuple:
+        """
+        Returns: `(events, notices)`, up to count events taken highest lane
+        first, and a "+N more" notice Event per drained lane that overflowed.
+
+        Parameters:
+        ---
+        `count` : `int`
+            -- Events to take at most, ie. a message's worth
+        """
+        events = []
+        notices = []
+        with self.lock:
+            for name, mtypes in LANES:
+                lane = self.lanes[name]
+                while lane and len(events) < count:
+                    events.append(lane.popleft())
+                if not lane and self.dropped[name]:
+                    notices.append(Event(f"+{self.dropped[name]}",
+                        f"more {name} messages", mtypes[0], COLORS['dark_teal']))
+                    self.dropped[name] = 0
+        return events, notices
+
+    def __len__(self) -> int:
+        return sum(len(lane) for lane in self.lanes.values())
+
+    def __bool__(self) -> bool:
+        """True while events or notices are waiting"""
+        return bool(len(self) or any(self.dropped.values()))
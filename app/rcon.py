@@ -0,0 +1,283 @@
+"""
+Module containing an asyncio client for the Source RCON protocol.
+
+Factorio and Minecraft servers accept console commands over RCON. Each packet
+is a little endian int32 length, followed by an int32 request id, an int32
+type, and a null terminated body plus an empty null terminated string. A
+client authenticates once per connection, then sends commands on it.
+
+A server's rcon is configured by an "rcon" entry in its containers.json dict:
+    "rcon": {"host": "factorio_1", "port": 27015, "password": "..."}
+`host` defaults to the server's docker_name, as containers share a docker
+network, and `port` to the game's default. `password_env` may name an
+environment variable holding the password in place of `password`.
+`max_in_flight` (default 4) limits commands awaiting a response at once, and
+`rate` (optional) limits commands sent per second.
+
+Authors: Emmett Peck (EmmettPeck)
+Version: October 18th, 2026
+"""
+
+import asyncio
+import logging
+import os
+import struct
+
+# Defaults of RconClient.from_config() by GameCog name
+RCON_DEFAULTS = {
+    'Factorio': {'port': 27015},
+    # Minecraft splits responses over 4096 bytes across packets
+    'Minecraft': {'port': 25575, 'multipacket': True},
+}
+
+
+class RconError(Exception):
+    """Raised when an rcon connection fails or is refused"""
+    pass
+
+
+class RconClient:
+    """
+    A persistent authenticated rcon connection to one server, multiplexing
+    concurrent commands by request id.
+
+    The connection is opened on the first command and reopened on the next
+    command after it drops. A reader task resolves each pending command when a
+    response with its id arrives. With `multipacket`, every command is followed
+    by an empty RESPONSE_VALUE packet the server answers after the command's
+    last response packet, marking where a fragmented response ends.
+
+    Attributes
+    ---
+    `host` : `str`
+        -- Hostname of the server
+    `port` : `int`
+        -- Rcon port of the server
+    `timeout` : `float`
+        -- Seconds to wait on connecting and each response
+    `max_in_flight` : `int`
+        -- Commands awaiting a response at once
+    `rate` : `float`
+        -- Commands sent per second at most, None if unlimited
+    """
+    AUTH = 3
+    AUTH_RESPONSE = 2
+    EXECCOMMAND = 2
+    RESPONSE_VALUE = 0
+
+    def __init__(self, host:str, port:int, password:str, timeout:float=10,
+        max_in_flight:int=4, rate:float=None, multipacket:bool=False):
+        self.host = host
+        self.port = port
+        self.password = password
+        self.timeout = timeout
+        self.max_in_flight = max_in_flight
+        self.rate = rate
+        self.multipacket = multipacket
+        self.reader = None
+        self.writer = None
+        self.reader_task = None
+        self.pending = {}   # Request id: future of its response
+        self.parts = {}     # Request id: response packets so far (multipacket)
+        self.markers = {}   # End marker id: request id (multipacket)
+        self.next_id = 0
+        self.next_send = 0
+        # Created on first command, within the running loop
+        self.connect_lock = None
+        self.write_lock = None
+        self.in_flight = None
+
+    @classmethod
+    def from_config(cls, config:dict, host:str=None, timeout:float=10,
+        port:int=27015, multipacket:bool=False):
+        """
+        Returns: RconClient of a containers.json "rcon" dict, None if no config
+
+        Parameters:
+        ---
+        `config` : `dict`
+            -- The "rcon" entry of a server's containers.json dict
+        `host` : `str`
+            -- Host to use if the config has none, ie. the docker_name
+        `port`, `multipacket`
+            -- Defaults of the game, see RCON_DEFAULTS
+        """
+        if not config:
+            return None
+        password = config.get('password')
+        if password is None and config.get('password_env'):
+            password = os.getenv(config['password_env'])
+        return cls(host=config.get('host', host),
+            port=int(config.get('port', port)),
+            password=password or '',
+            timeout=timeout,
+            max_in_flight=int(config.get('max_in_flight', 4)),
+            rate=config.get('rate'),
+            multipacket=config.get('multipacket', multipacket))
+
+    def is_connected(self) -> bool:
+        return (self.writer is not None and not self.writer.is_closing()
+            and self.reader_task is not None and not self.reader_task.done())
+
+    def get_id(self) -> int:
+        """Returns: next request id, positive as -1 marks failed auth"""
+        self.next_id = self.next_id % 0x7fffffff + 1
+        return self.next_id
+
+    def write_packet(self, request_id:int, packet_type:int, body:str):
+        packet = (struct.pack('<ii', request_id, packet_type)
+            + body.encode('utf-8') + b'\x00\x00')
+        self.writer.write(struct.pack('<i', len(packet)) + packet)
+
+    async def read_packet(self) -> tuple:
+        """Returns: `(request_id, type, body)` of the next packet"""
+        length, = struct.unpack('<i', await self.reader.readexactly(4))
+        if length < 10:
+            raise RconError(f"{self.host}:{self.port} sent a malformed packet")
+        data = await self.reader.readexactly(length)
+        request_id, packet_type = struct.unpack('<ii', data[:8])
+        return request_id, packet_type, data[8:-2].decode('utf-8', errors='replace')
+
+    async def connect(self):
+        """Opens and authenticates the connection, raising RconError if refused"""
+        self.close()
+        try:
+            self.reader, self.writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port), self.timeout)
+            request_id = self.get_id()
+            self.write_packet(request_id, self.AUTH, self.password)
+            await self.writer.drain()
+            while True:
+                response_id, packet_type, body = await asyncio.wait_for(
+                    self.read_packet(), self.timeout)
+                # Some servers send an empty RESPONSE_VALUE before the answer
+                if packet_type == self.AUTH_RESPONSE:
+                    break
+        except (OSError, RconError, asyncio.IncompleteReadError,
+            asyncio.TimeoutError) as e:
+            self.close()
+            raise RconError(f"{self.host}:{self.port} connection failed: {e}") from e
+        if response_id == -1:
+            self.close()
+            raise RconError(f"{self.host}:{self.port} refused the rcon password")
+        self.reader_task = asyncio.ensure_future(self.read_responses())
+        logging.info(f"Rcon connected to {self.host}:{self.port}")
+
+    async def read_responses(self):
+        """Resolves pending commands with their responses until disconnected"""
+        try:
+            while True:
+                response_id, packet_type, body = await self.read_packet()
+                if response_id in self.markers:
+                    request_id = self.markers.pop(response_id)
+                    self.resolve(request_id, ''.join(self.parts.pop(request_id, [])))
+                elif response_id in self.parts:
+                    self.parts[response_id].append(body)
+                else:
+                    self.resolve(response_id, body)
+        except (OSError, RconError, asyncio.IncompleteReadError) as e:
+            logging.warning(f"Rcon {self.host}:{self.port} disconnected: {e}")
+        finally:
+            self.fail_pending(RconError(f"{self.host}:{self.port} disconnected"))
+            if self.writer is not None:
+                self.writer.close()
+
+    def resolve(self, request_id:int, body:str):
+        future = self.pending.get(request_id)
+        if future is not None and not future.done():
+            future.set_result(body)
+
+    def fail_pending(self, error:Exception):
+        for future in self.pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+    async def pace(self):
+        """Waits until a command may be sent under rate"""
+        if not self.rate:
+            return
+        now = asyncio.get_event_loop().time()
+        wait = self.next_send - now
+        self.next_send = max(now, self.next_send) + 1/self.rate
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    async def command(self, command:str) -> str:
+        """
+        Returns: the server's response to command
+
+        Connects first if not connected. A command failing because a connection
+        that was open dropped is retried once on a new connection, as servers
+        drop connections when restarted. Raises RconError if it can not be sent
+        or is not answered within twice timeout, all attempts included, so
+        callers' own timeouts can be set to leave room for a fallback.
+
+        Parameters:
+        ---
+        `command` : `str`
+            -- Console command, ie. "/players online"
+        """
+        if self.in_flight is None:
+            self.connect_lock = asyncio.Lock()
+            self.write_lock = asyncio.Lock()
+            self.in_flight = asyncio.Semaphore(self.max_in_flight)
+        async with self.in_flight:
+            await self.pace()
+            try:
+                return await asyncio.wait_for(self.attempt(command),
+                    2*self.timeout)
+            except asyncio.TimeoutError as e:
+                raise RconError(f"{self.host}:{self.port} command timed out") from e
+
+    async def attempt(self, command:str) -> str:
+        """Returns: response to command, retried once if a reused connection dropped"""
+        reused = self.is_connected()
+        try:
+            return await self.request(command)
+        except RconError:
+            if not reused or self.is_connected():
+                raise
+            logging.warning(f"Rcon {self.host}:{self.port} dropped, reconnecting")
+            return await self.request(command)
+
+    async def request(self, command:str) -> str:
+        """Returns: response to command, connecting first if needed"""
+        async with self.connect_lock:
+            if not self.is_connected():
+                await self.connect()
+
+        request_id = self.get_id()
+        future = asyncio.get_event_loop().create_future()
+        self.pending[request_id] = future
+        marker = None
+        if self.multipacket:
+            marker = self.get_id()
+            self.parts[request_id] = []
+            self.markers[marker] = request_id
+        try:
+            async with self.write_lock:
+                self.write_packet(request_id, self.EXECCOMMAND, command)
+                if marker is not None:
+                    self.write_packet(marker, self.RESPONSE_VALUE, '')
+                await self.writer.drain()
+            return await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError as e:
+            # Before OSError, which TimeoutError subclasses since python 3.11.
+            # Others may be in flight, a late response is dropped unresolved
+            raise RconError(f"{self.host}:{self.port} command timed out") from e
+        except (OSError, AttributeError) as e:
+            # AttributeError: writer dropped by a concurrent disconnect
+            self.close()
+            raise RconError(f"{self.host}:{self.port} command failed: {e}") from e
+        finally:
+            self.pending.pop(request_id, None)
+            self.parts.pop(request_id, None)
+            self.markers.pop(marker, None)
+
+    def close(self):
+        if self.reader_task is not None:
+            self.reader_task.cancel()
+        if self.writer is not None:
+            self.writer.close()
+        self.fail_pending(RconError(f"{self.host}:{self.port} closed"))
+        self.reader = self.writer = self.reader_task = None
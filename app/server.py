@@ -1,8 +1,16 @@
+from collections import deque
 from dataclasses import dataclass
 import discord
+from circuit_breaker import CircuitBreaker
 from fingerprints import FingerPrints
+from headers import HeaderManager
+from log_sources import make_log_source
+from outbox import Outbox
+from rcon import RCON_DEFAULTS, RconClient
 import queue
-from messages import split_first
+import threading
+from docker.errors import NotFound
+from database import DB
 
 
 @dataclass
@@ -11,28 +19,109 @@ class Server:
     bot: discord.ext.commands.Bot # Bot instance
     server: dict                  # containers.json dict
     statistics: list              # Statistics Filetree
-    # Post
-    online_players: list = None         # List of online players
-    cid: int = None                     # Channel ID
-    server_name: str = None             # Server Name
-    docker_name: str = None             # Docker Name
-    cog_name: str = None
-    version: str = None                 # Server Version
-    fingerprint: FingerPrints = None    # Fingerprint instance
-    connect_queue: queue.Queue = None   # Connect Queue
-    message_queue: queue.Queue = None   # Message Queue
-    player_max: int = -1                # Max Players (Default -1 for ∞)
+    cog_name: str                 # Name of the GameCog the server belongs to
+
+    # Slotted; set in __post_init__ rather than as dataclass fields, since a
+    # field default would clash with its slot
+    __slots__ = ('bot', 'server', 'statistics', 'cog_name',
+        'online_players',   # List of online players
+        'cid',              # Channel ID
+        'server_name',      # Server Name
+        'docker_name',      # Docker Name
+        'version',          # Server Version
+        'fingerprint',      # Fingerprint instance
+        'connect_queue',    # Connect Queue
+        'outbox',           # Events awaiting relay to discord, see outbox.py
+        'relay_task',       # Task relaying outbox
+        'player_max',       # Max Players (Default -1 for ∞)
+        'log_source',       # Log source, see log_sources.py
+        'poll_interval',    # Seconds between active passes
+        'poll_ceiling',     # Max seconds between idle passes
+        'current_interval', # Seconds until next pass
+        'wake_event',       # Set to interrupt an idle wait
+        'ingest_task',      # Supervised ingestion task
+        'ingest_failures',  # Ingestion tasks failed in a row
+        'breaker',          # Guards docker/rcon calls
+        'rcon',             # RconClient if configured, see rcon.py
+        'chat_outbox',      # Discord messages awaiting relay to the game
+        'chat_task',        # Task relaying chat_outbox
+        'header',           # HeaderManager of the linked channel, see headers.py
+        'webhook',          # Relay Webhook, False if unavailable, see webhooks.py
+        'container',        # Cached docker container handle
+        'read_lock',        # Held by the thread reading the log source
+        'ready')            # Statistics & players loaded
 
     def __post_init__(self):
+        self.online_players = []
         self.connect_queue = queue.Queue()  # Connect Queue
-        self.message_queue = queue.Queue()
+        self.outbox = Outbox(DB.get_outbox_limits(),
+            self.server.get('overflow', DB.get_outbox_overflow()),
+            DB.get_channel_rate())
+        self.relay_task = None
         self.version = self.server.get('version')
         self.cid = self.server.get('channel_id')
         self.server_name = self.server.get('name')
         self.docker_name = self.server.get('docker_name')
+        self.player_max = -1
+        self.poll_interval = self.server.get(
+            'poll_interval', DB.get_chat_link_time())
+        self.poll_ceiling = self.server.get(
+            'poll_ceiling', DB.get_poll_ceiling())
+        self.current_interval = self.poll_interval
+        self.wake_event = None
+        self.ingest_task = None
+        self.ingest_failures = 0
+        self.container = None
+        self.read_lock = threading.Lock()
+        self.ready = False
+        self.chat_outbox = deque(maxlen=DB.get_chat_queue_len())
+        self.chat_task = None
+        self.webhook = None
+        self.header = HeaderManager(self.server_name, DB.get_header_rate(),
+            DB.get_header_debounce())
         self.fingerprint = FingerPrints(self.docker_name)
-    
-    
+        self.log_source = make_log_source(self.server)
+        self.rcon = RconClient.from_config(self.server.get('rcon'),
+            host=self.docker_name, timeout=DB.get_rcon_timeout(),
+            **RCON_DEFAULTS.get(self.cog_name, {}))
+        self.breaker = CircuitBreaker(self.server_name,
+            DB.get_breaker_threshold(), *DB.get_breaker_backoff())
+
+
+    def get_container(self):
+        """Returns: docker container handle, inspected only on first use"""
+        if self.container is None:
+            self.container = DB.client.containers.get(self.docker_name)
+        return self.container
+
+    def invalidate_container(self):
+        """Drops the cached container handle, ie. after a container is removed"""
+        self.container = None
+
+    def use_container(self, func):
+        """
+        Returns: func(container) using the cached container handle
+
+        If the handle is stale (container removed or recreated) it is dropped
+        and func retried once with a freshly fetched handle.
+        """
+        try:
+            return func(self.get_container())
+        except NotFound:
+            self.invalidate_container()
+            return func(self.get_container())
+
+    def backoff(self):
+        """Doubles the wait between passes, up to poll_ceiling"""
+        self.current_interval = min(
+            self.current_interval*2, self.poll_ceiling)
+
+    def wake(self):
+        """Snaps back to poll_interval, ending a backed off wait early"""
+        self.current_interval = self.poll_interval
+        if self.wake_event:
+            self.wake_event.set()
+
     ''' Statistics Filetree
     For manipulation and access on load, not held in memory due to large amounts of data
         - data
@@ -0,0 +1,64 @@
+"""
+Tests of discord->game chat relay through GameCog.queue_chat & relay_chat.
+
+Authors: Emmett Peck (EmmettPeck)
+Version: October 18th, 2026
+"""
+
+import asyncio
+import types
+
+from cogs.gamecog import GameCog
+from database import DB
+from rcon import RconError
+from server import Server
+
+
+class ChatCog(GameCog):
+    """GameCog sending chat to a list, failing the first `failures` sends"""
+
+    def __init__(self, bot, failures=0):
+        super().__init__(bot)
+        self.sent = []
+        self.failures = failures
+
+    def get_version(self) -> str:
+        return "Chat"
+
+    def get_chat_command(self, message:str) -> str:
+        return f"say {message}"
+
+    def get_chat_limit(self) -> int:
+        return 20
+
+    async def send_message(self, server:Server, message:str):
+        if self.failures:
+            self.failures -= 1
+            raise RconError("connection refused")
+        self.sent.append(message)
+
+def relay(messages:list, failures:int=0) -> ChatCog:
+    """Returns: ChatCog after queueing messages to a server and relaying them"""
+    async def main():
+        cog = ChatCog(types.SimpleNamespace(loop=asyncio.get_event_loop()),
+            failures)
+        server = Server(bot=None, statistics=[], cog_name='Chat',
+            server={'name': 'chat', 'docker_name': 'chat', 'version': 'Chat'})
+        for message in messages:
+            cog.queue_chat(server, message)
+        # Failing sends retry without end, fail the test instead
+        await asyncio.wait_for(server.chat_task, 5)
+        assert not server.chat_outbox
+        return cog
+    return asyncio.run(main())
+
+def test_chat_relayed_in_batches(monkeypatch):
+    monkeypatch.setattr(DB, 'CHAT_COALESCE_TIME', 0)
+    cog = relay(["first", "second", "a longer third"])
+    assert cog.sent == ["first\nsecond", "a longer third"]
+
+def test_failed_chat_requeued_in_order(monkeypatch):
+    monkeypatch.setattr(DB, 'CHAT_COALESCE_TIME', 0)
+    monkeypatch.setattr(DB, 'BREAKER_BACKOFF', (0.01, 0.05))
+    cog = relay(["first", "second", "a longer third"], failures=2)
+    assert cog.sent == ["first\nsecond", "a longer third"]
@@ -0,0 +1,54 @@
+"""
+Tests of CircuitBreaker, and of GameCog.call guarded by it.
+
+Authors: Emmett Peck (EmmettPeck)
+Version: October 18th, 2026
+"""
+
+import asyncio
+import types
+
+import pytest
+
+from circuit_breaker import CircuitBreaker
+from cogs.gamecog import GameCog
+from server import Server
+
+
+def make_breaker() -> CircuitBreaker:
+    return CircuitBreaker('test', threshold=2, backoff_min=0, backoff_max=0)
+
+def test_opens_after_threshold_and_probes():
+    breaker = make_breaker()
+    breaker.record_failure()
+    assert breaker.is_closed()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.is_closed()
+
+def test_cancelled_probe_reopens():
+    async def main():
+        cog = GameCog(types.SimpleNamespace(loop=asyncio.get_event_loop()))
+        server = Server(bot=None, statistics=[], cog_name='Test',
+            server={'name': 'test', 'docker_name': 'test'})
+        server.breaker = breaker = make_breaker()
+        breaker.record_failure()
+        breaker.record_failure()
+
+        probe = asyncio.ensure_future(
+            cog.call(server, 'rcon', asyncio.sleep, 60))
+        await asyncio.sleep(0)
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+        # The next call probes instead of being refused forever
+        assert breaker.state == CircuitBreaker.OPEN
+        assert await cog.call(server, 'rcon', asyncio.sleep, 0, 'up') == 'up'
+        assert breaker.is_closed()
+    asyncio.run(main())
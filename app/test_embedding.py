@@ -0,0 +1,33 @@
+"""
+Tests of plain text relay formatting.
+
+Authors: Emmett Peck (EmmettPeck)
+Version: October 18th, 2026
+"""
+
+import re
+
+from embedding import MESSAGE_LIMIT, pack_text
+from messages import COLORS, Event, MessageType
+
+# What discord would render as a ping in message content
+MENTION = re.compile(r"@(everyone|here)|<@[!&]?\d+>")
+
+
+def test_packed_content_can_not_mention():
+    events = [Event("<Steve>", message, MessageType.MSG, COLORS['blue'])
+        for message in ("@everyone look", "@here", "hi <@&123456789012345678>",
+            "<@!123456789012345678> and <@123456789012345678>")]
+    contents = pack_text(events)
+    assert contents
+    for content in contents:
+        assert MENTION.search(content) is None, content
+
+
+def test_packed_content_keeps_order_within_limit():
+    events = [Event("<Steve>", f"message {i}", MessageType.MSG, COLORS['blue'])
+        for i in range(300)]
+    contents = pack_text(events)
+    assert all(len(content) <= MESSAGE_LIMIT for content in contents)
+    lines = "\n".join(contents).split("\n")
+    assert [line.rsplit(' ', 1)[1] for line in lines] == [str(i) for i in range(300)]
@@ -0,0 +1,45 @@
+"""
+Tests of the reference game specs against the hand-written parsers they stand
+in for.
+
+Authors: Emmett Peck (EmmettPeck)
+Version: October 18th, 2026
+"""
+
+import json
+import os
+
+import pytest
+
+from cogs.factorio import Factorio
+from cogs.specgame import load_spec_cogs
+from database import DB
+from game_spec import GameSpec
+
+FACTORIO_LINES = (
+    "2022-05-27 12:34:56 [CHAT] Steve: hello there",
+    "2022-05-27 12:34:56 [CHAT] Steve: a: message with colons",
+    "2022-05-27 12:34:56 [CHAT] Steve [Engineers]: hi",
+    "2022-05-27 12:34:56 [JOIN] Steve joined the game",
+    "2022-05-27 12:34:56 [LEAVE] Steve left the game",
+    "2022-05-27 12:34:56 [COMMAND] Steve (command): /c game.print(1)",
+    "   1.234 Info ServerMultiplayerManager.cpp:123: updateTick(4) changing state",
+    # Our own relayed messages are not events
+    "2022-05-27 12:34:56 [CHAT] <server>: hi",
+    "2022-05-27 12:34:56 [CHAT] <server> : hi",
+)
+
+@pytest.fixture(scope='module')
+def factorio_spec():
+    return GameSpec.load(os.path.join(DB.get_spec_dir(), 'factorio.json'))
+
+@pytest.mark.parametrize('line', FACTORIO_LINES)
+def test_factorio_spec_parity(factorio_spec, line):
+    assert factorio_spec.parse(line) == Factorio.parse(line)
+
+def test_spec_names_can_not_replace_module_names(tmp_path):
+    for file, name in (('a.json', 'setup'), ('b.json', 'Not a name'),
+        ('c.json', 'Valheim'), ('d.json', 'Valheim')):
+        with open(tmp_path / file, 'w') as write_file:
+            json.dump({'name': name, 'rules': []}, write_file)
+    assert list(load_spec_cogs(str(tmp_path))) == ['Valheim']
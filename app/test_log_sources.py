@@ -0,0 +1,82 @@
+"""
+Tests of LogFileTailer against plain temp files, polled directly rather than
+from its thread.
+
+Authors: Emmett Peck (EmmettPeck)
+Version: October 18th, 2026
+"""
+
+import os
+
+import pytest
+
+from log_sources import LogFileTailer
+
+
+def write(path, text:str, mode='a'):
+    with open(path, mode) as write_file:
+        write_file.write(text)
+
+def lines(tailer:LogFileTailer) -> list:
+    """Returns: text of lines read by a poll of tailer"""
+    tailer.poll()
+    return [line for nanos, position, line in tailer.drain()]
+
+@pytest.fixture
+def log(tmp_path):
+    path = tmp_path / 'latest.log'
+    write(path, "old line\n", 'w')
+    return path
+
+def make_tailer(tmp_path, log) -> LogFileTailer:
+    return LogFileTailer('test', str(log), str(tmp_path / 'offset.json'))
+
+def test_tails_from_end_and_holds_partial_lines(tmp_path, log):
+    tailer = make_tailer(tmp_path, log)
+    assert lines(tailer) == []
+    write(log, "first\nsecond\nhalf")
+    assert lines(tailer) == ["first", "second"]
+    write(log, " done\r\n\n")
+    assert lines(tailer) == ["half done"]
+
+def test_resumes_after_committed_line(tmp_path, log):
+    tailer = make_tailer(tmp_path, log)
+    lines(tailer)
+    write(log, "first\nsecond\n")
+    tailer.poll()
+    first, second = tailer.drain()
+    tailer.commit(first[0], first[1])
+    tailer._close()
+
+    # Lines after the committed one are read again, and new ones after
+    write(log, "third\n")
+    assert lines(make_tailer(tmp_path, log)) == ["second", "third"]
+
+def test_follows_rotation(tmp_path, log):
+    tailer = make_tailer(tmp_path, log)
+    lines(tailer)
+    write(log, "before\n")
+    os.rename(log, tmp_path / 'rotated.log')
+    write(tmp_path / 'rotated.log', "last of old\n")
+    write(log, "new file\n", 'w')
+    assert lines(tailer) == ["before", "last of old", "new file"]
+
+def test_follows_truncation(tmp_path, log):
+    tailer = make_tailer(tmp_path, log)
+    write(log, "a longer line than the next\n")
+    assert lines(tailer) == []
+    write(log, "short\n", 'w')
+    assert lines(tailer) == ["short"]
+
+def test_saved_offset_of_another_file_reads_from_start(tmp_path, log):
+    tailer = make_tailer(tmp_path, log)
+    lines(tailer)
+    write(log, "first\n")
+    tailer.poll()
+    nanos, position, line = tailer.drain()[0]
+    tailer.commit(nanos, position)
+    tailer._close()
+
+    os.remove(log)
+    write(log, "replaced\n", 'w')
+    assert lines(make_tailer(tmp_path, log)) == ["replaced"]
@@ -0,0 +1,168 @@
+"""
+Tests of RconClient against a local fake rcon server.
+
+Authors: Emmett Peck (EmmettPeck)
+Version: October 18th, 2026
+"""
+
+import asyncio
+import struct
+
+import pytest
+
+from rcon import RconClient, RconError
+
+PASSWORD = "hunter2"
+
+
+class FakeRconServer:
+    """
+    A local rcon server speaking the Source protocol. Answers "echo <text>"
+    to commands, Minecraft style end markers to empty RESPONSE_VALUE packets,
+    and a few special commands:
+     - "big": a 10000 byte response split over 4096 byte packets
+     - "slow": answered after 0.2s
+     - "silent": never answered
+     - "drop": closes the connection
+    """
+
+    def __init__(self):
+        self.server = None
+        self.port = None
+        self.connections = 0
+        self.writers = []
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, '127.0.0.1', 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        for writer in self.writers:
+            writer.close()
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        self.writers.append(writer)
+
+        def send(request_id, packet_type, body):
+            packet = (struct.pack('<ii', request_id, packet_type)
+                + body.encode() + b'\x00\x00')
+            writer.write(struct.pack('<i', len(packet)) + packet)
+
+        try:
+            while True:
+                length, = struct.unpack('<i', await reader.readexactly(4))
+                data = await reader.readexactly(length)
+                request_id, packet_type = struct.unpack('<ii', data[:8])
+                body = data[8:-2].decode()
+                if packet_type == RconClient.AUTH:
+                    send(request_id if body == PASSWORD else -1,
+                        RconClient.AUTH_RESPONSE, '')
+                elif packet_type == RconClient.RESPONSE_VALUE:
+                    send(request_id, RconClient.RESPONSE_VALUE, 'Unknown request 0')
+                elif body == 'big':
+                    response = 'x'*10000
+                    for i in range(0, len(response), 4096):
+                        send(request_id, RconClient.RESPONSE_VALUE,
+                            response[i:i+4096])
+                elif body == 'slow':
+                    await asyncio.sleep(0.2)
+                    send(request_id, RconClient.RESPONSE_VALUE, 'slow done')
+                elif body == 'silent':
+                    continue
+                elif body == 'drop':
+                    writer.close()
+                    return
+                else:
+                    send(request_id, RconClient.RESPONSE_VALUE, f"echo {body}")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+
+
+def run(test):
+    """Runs test(fake_server) on a fresh loop and fake server"""
+    async def main():
+        server = await FakeRconServer().start()
+        try:
+            return await test(server)
+        finally:
+            await server.stop()
+    return asyncio.run(main())
+
+
+def test_command_response():
+    async def test(server):
+        client = RconClient('127.0.0.1', server.port, PASSWORD, timeout=2)
+        assert await client.command("/players online") == "echo /players online"
+        assert await client.command("again") == "echo again"
+        assert server.connections == 1
+        client.close()
+    run(test)
+
+def test_refused_password():
+    async def test(server):
+        client = RconClient('127.0.0.1', server.port, "wrong", timeout=2)
+        with pytest.raises(RconError, match="refused"):
+            await client.command("list")
+    run(test)
+
+def test_multipacket_response():
+    async def test(server):
+        client = RconClient('127.0.0.1', server.port, PASSWORD, timeout=2,
+            multipacket=True)
+        assert await client.command("big") == 'x'*10000
+        assert await client.command("after") == "echo after"
+        client.close()
+    run(test)
+
+def test_concurrent_commands_multiplexed():
+    async def test(server):
+        client = RconClient('127.0.0.1', server.port, PASSWORD, timeout=2)
+        responses = await asyncio.gather(client.command("slow"),
+            *[client.command(f"m{i}") for i in range(6)])
+        assert responses == ["slow done"] + [f"echo m{i}" for i in range(6)]
+        assert server.connections == 1
+        client.close()
+    run(test)
+
+def test_reconnects_after_drop():
+    async def test(server):
+        client = RconClient('127.0.0.1', server.port, PASSWORD, timeout=2)
+        assert await client.command("first") == "echo first"
+        with pytest.raises(RconError):
+            await client.command("drop")
+        assert await client.command("after") == "echo after"
+        assert server.connections >= 2
+        client.close()
+    run(test)
+
+def test_unanswered_command_times_out():
+    async def test(server):
+        client = RconClient('127.0.0.1', server.port, PASSWORD, timeout=0.3)
+        with pytest.raises(RconError, match="timed out"):
+            await client.command("silent")
+        # The connection stays usable for other commands
+        assert await client.command("next") == "echo next"
+        client.close()
+    run(test)
+
+def test_rate_limit():
+    async def test(server):
+        client = RconClient('127.0.0.1', server.port, PASSWORD, timeout=2,
+            rate=20)
+        loop = asyncio.get_event_loop()
+        start = loop.time()
+        await asyncio.gather(*[client.command("x") for i in range(5)])
+        assert loop.time() - start >= 4/20 - 0.01
+        client.close()
+    run(test)
+
+def test_from_config():
+    assert RconClient.from_config(None, host='factorio_1') is None
+    client = RconClient.from_config({'password': PASSWORD, 'rate': 5},
+        host='factorio_1', port=27015)
+    assert (client.host, client.port, client.rate) == ('factorio_1', 27015, 5)
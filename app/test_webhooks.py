@@ -0,0 +1,100 @@
+"""
+Tests of webhook relay sends against a local stand-in for the discord API.
+
+Authors: Emmett Peck (EmmettPeck)
+Version: October 18th, 2026
+"""
+
+import asyncio
+
+import aiohttp
+from aiohttp import web
+import pytest
+
+from database import DB
+from webhooks import Webhook, WebhookError
+
+
+class FakeDiscord:
+    """
+    A local webhook execute endpoint answering with queued (status, headers,
+    body) responses, 204 once none are left, recording each request.
+    """
+
+    def __init__(self, responses=()):
+        self.responses = list(responses)
+        self.requests = []
+        self.runner = None
+
+    async def start(self, monkeypatch):
+        app = web.Application()
+        app.router.add_post('/api/webhooks/{id}/{token}', self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        monkeypatch.setattr(DB, 'DISCORD_API', f"http://127.0.0.1:{port}/api")
+        return self
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+    async def handle(self, request):
+        self.requests.append((asyncio.get_event_loop().time(),
+            request.match_info['id'], dict(request.query), await request.json()))
+        if not self.responses:
+            return web.Response(status=204)
+        status, headers, body = self.responses.pop(0)
+        return web.json_response(body, status=status, headers=headers)
+
+def run(monkeypatch, test, responses=()):
+    """Runs test(fake, webhook, session) against a fresh FakeDiscord"""
+    async def main():
+        fake = await FakeDiscord(responses).start(monkeypatch)
+        try:
+            async with aiohttp.ClientSession() as session:
+                return await test(fake, Webhook(42, 'token'), session)
+        finally:
+            await fake.stop()
+    return asyncio.run(main())
+
+def test_execute_posts_as_player(monkeypatch):
+    async def test(fake, webhook, session):
+        await webhook.execute(session, "hi @everyone", "Steve",
+            "https://mc-heads.net/avatar/Steve/64")
+        (time, webhook_id, query, payload), = fake.requests
+        assert webhook_id == '42' and query == {'wait': 'false'}
+        assert payload == {'content': "hi @everyone", 'username': "Steve",
+            'avatar_url': "https://mc-heads.net/avatar/Steve/64",
+            'allowed_mentions': {'parse': []}}
+    run(monkeypatch, test)
+
+def test_rate_limited_send_retried_after(monkeypatch):
+    async def test(fake, webhook, session):
+        await webhook.execute(session, "hi", "Steve")
+        first, second = fake.requests
+        assert second[0] - first[0] >= 0.2 - 0.01
+    run(monkeypatch, test, [(429, {}, {'retry_after': 0.2})])
+
+def test_empty_bucket_waits_for_reset(monkeypatch):
+    async def test(fake, webhook, session):
+        await webhook.execute(session, "first", "Steve")
+        await webhook.execute(session, "second", "Steve")
+        first, second = fake.requests
+        assert second[0] - first[0] >= 0.2 - 0.01
+    run(monkeypatch, test, [(200, {'X-RateLimit-Remaining': '0',
+        'X-RateLimit-Reset-After': '0.2'}, {})])
+
+def test_refused_send_raises(monkeypatch):
+    async def test(fake, webhook, session):
+        with pytest.raises(WebhookError, match="404"):
+            await webhook.execute(session, "hi", "Steve")
+    run(monkeypatch, test, [(404, {}, {'message': "Unknown Webhook"})])
+
+def test_still_rate_limited_raises(monkeypatch):
+    async def test(fake, webhook, session):
+        with pytest.raises(WebhookError, match="still rate limited"):
+            await webhook.execute(session, "hi", "Steve")
+        assert len(fake.requests) == Webhook.RETRIES
+    run(monkeypatch, test, [(429, {}, {'retry_after': 0.01})]*Webhook.RETRIES)
@@ -8,8 +8,9 @@ import http.client
 import json
 
 class UsernameToUUID:
-    def __init__(self, username):
+    def __init__(self, username, timeout=None):
         self.username = username
+        self.timeout = timeout
 
     def get_uuid(self, timestamp=None):
         """
@@ -22,7 +23,7 @@ class UsernameToUUID:
         """
         get_args = "" if timestamp is None else "?at=" + str(timestamp)
 
-        http_conn = http.client.HTTPSConnection("api.mojang.com");
+        http_conn = http.client.HTTPSConnection("api.mojang.com", timeout=self.timeout);
         http_conn.request("GET", "/users/profiles/minecraft/" + self.username + get_args,
             headers={'User-Agent':'Minecraft Username -> UUID', 'Content-Type':'application/json'});
         response = http_conn.getresponse().read().decode("utf-8")
@@ -0,0 +1,141 @@
+"""
+Module containing a client for relaying game chat through discord webhooks.
+
+Servers with "relay": "webhook" in their containers.json dict post player chat
+through a webhook Pinebot manages in the linked channel, under the player's
+name and avatar. Webhook sends count against the webhook's own rate limit
+rather than the bot's, and read like native chat.
+
+Every webhook shares one persistent aiohttp session. Sends to a webhook are
+made one at a time, tracking its rate limit bucket from the response headers;
+a webhook with no requests remaining waits out its reset before sending again,
+and a 429 is retried after its retry_after.
+
+Authors: Emmett Peck (EmmettPeck)
+Version: October 18th, 2026
+"""
+
+import asyncio
+import logging
+
+import aiohttp
+
+from database import DB, singleton
+
+
+class WebhookError(Exception):
+    """Raised when a webhook send fails"""
+    pass
+
+
+class Webhook:
+    """
+    A discord webhook and its rate limit bucket.
+
+    Attributes
+    ---
+    `webhook_id` : `int`
+        -- Id of the webhook
+    `reset_at` : `float`
+        -- Loop time the bucket resets at, while no requests remain
+    """
+    RETRIES = 3
+
+    def __init__(self, webhook_id:int, token:str):
+        self.webhook_id = webhook_id
+        self.token = token
+        self.reset_at = 0
+        self.lock = None
+
+    def get_url(self) -> str:
+        return f"{DB.get_discord_api()}/webhooks/{self.webhook_id}/{self.token}"
+
+    async def execute(self, session:aiohttp.ClientSession, content:str,
+        username:str, avatar_url:str=None):
+        """
+        Posts content as username, waiting on the webhook's rate limit.
+        Raises WebhookError if discord refuses it.
+
+        Parameters:
+        ---
+        `session` : `aiohttp.ClientSession`
+            -- Session to post with
+        `content` : `str`
+            -- Message text, up to 2000 characters
+        `username` : `str`
+            -- Name to post as
+        `avatar_url` : `str`
+            -- Avatar to post with, the webhook's own if None
+        """
+        payload = {'content': content, 'username': username[:80],
+            'allowed_mentions': {'parse': []}}
+        if avatar_url:
+            payload['avatar_url'] = avatar_url
+
+        if self.lock is None:
+            self.lock = asyncio.Lock()
+        async with self.lock:
+            for attempt in range(self.RETRIES):
+                loop = asyncio.get_event_loop()
+                wait = self.reset_at - loop.time()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                try:
+                    async with session.post(self.get_url(), json=payload,
+                        params={'wait': 'false'}) as response:
+                        self.update_bucket(response)
+                        if response.status == 429:
+                            data = await response.json(content_type=None)
+                            retry_after = float(data.get('retry_after', 1))
+                            logging.warning(f"Webhook {self.webhook_id} rate "
+                                f"limited, retrying in {retry_after}s")
+                            self.reset_at = loop.time() + retry_after
+                            continue
+                        if response.status >= 400:
+                            raise WebhookError(f"Webhook {self.webhook_id} "
+                                f"send failed: {response.status} {await response.text()}")
+                        return
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    raise WebhookError(f"Webhook {self.webhook_id} send failed: {e}") from e
+            raise WebhookError(f"Webhook {self.webhook_id} still rate limited")
+
+    def update_bucket(self, response:aiohttp.ClientResponse):
+        """Holds sends until reset once a response shows none remaining"""
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        reset_after = response.headers.get('X-RateLimit-Reset-After')
+        if remaining == '0' and reset_after is not None:
+            self.reset_at = asyncio.get_event_loop().time() + float(reset_after)
+
+
+@singleton
+class Webhooks:
+    """
+    A singleton of the shared session and Webhook buckets, by webhook id.
+    """
+    def __init__(self):
+        self.session = None
+        self.webhooks = {}
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """Returns: the shared session, opened on first use"""
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=DB.get_io_timeouts()['http']))
+        return self.session
+
+    def get(self, webhook_id:int, token:str) -> Webhook:
+        """Returns: Webhook of id, sharing its bucket between callers"""
+        webhook = self.webhooks.get(webhook_id)
+        if webhook is None or webhook.token != token:
+            webhook = self.webhooks[webhook_id] = Webhook(webhook_id, token)
+        return webhook
+
+    async def execute(self, webhook:Webhook, content:str, username:str,
+        avatar_url:str=None):
+        """Posts content through webhook with the shared session"""
+        await webhook.execute(self.get_session(), content, username, avatar_url)
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
@@ -0,0 +1,99 @@
+"""
+Micro-benchmark of FingerPrints.is_unique_fingerprint, the ring buffer & set
+window, against the former newest-first list window it replaced.
+
+Lines are unique log lines with a share replayed from the recent window, as
+re-reading a docker log tail does. The list window saved its json file on every
+unique line; it is timed with and without that save.
+
+    python bench/bench_fingerprints.py [lines] [replay share]
+
+Authors: Emmett Peck (EmmettPeck)
+Version: October 18th, 2026
+"""
+
+import hashlib
+import json
+import random
+import sys
+
+from harness import best_of, report
+
+from fingerprints import FingerPrints
+
+
+class ListFingerPrints:
+    """The former window; full sha256 ints in a list, newest first"""
+
+    def __init__(self, docker_name, size, save=True):
+        self.name = docker_name
+        self.size = size
+        self.save = save
+        self.fingerprintDB = []
+
+    def save_fingerprintDB(self):
+        with open(rf"data/hashes/hash_{self.name}.json", 'w') as write_file:
+            json.dump(self.fingerprintDB, write_file, indent = 2)
+
+    def get_hash_int(self, instr):
+        sha256hash = hashlib.sha256()
+        sha256hash.update(instr.encode('utf8'))
+        return int(sha256hash.hexdigest(), 16)
+
+    def is_unique_fingerprint(self, string):
+        fingerprint = self.get_hash_int(string)
+        try:
+            self.fingerprintDB.index(fingerprint)
+        except ValueError:
+            self.fingerprintDB.insert(0, fingerprint)
+            if len(self.fingerprintDB) > self.size-1:
+                try:
+                    self.fingerprintDB.pop(self.size)
+                except IndexError:
+                    pass
+            if self.save:
+                self.save_fingerprintDB()
+            return True
+        return False
+
+def make_lines(count:int, replay:float, window:int) -> list:
+    """Returns: count log lines, replay share of them repeating recent lines"""
+    rng = random.Random(0)
+    lines = []
+    for i in range(count):
+        if lines and rng.random() < replay:
+            lines.append(lines[-rng.randint(1, min(window, len(lines)))])
+        else:
+            lines.append(f"[12:34:56] [Server thread/INFO]: <Steve> message {i}")
+    return lines
+
+def run(window, lines):
+    unique = 0
+    for line in lines:
+        unique += window.is_unique_fingerprint(line)
+    return unique
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    replay = float(sys.argv[2]) if len(sys.argv) > 2 else 0.25
+
+    for size in (100, 1000, 10000):
+        lines = make_lines(count, replay, size)
+        print(f"window {size}, {count} lines, {replay:.0%} replayed")
+        assert (run(FingerPrints('bench', size), lines)
+            == run(ListFingerPrints('bench-list', size, False), lines))
+        ring = best_of(lambda: run(FingerPrints('bench', size), lines))
+        plain = best_of(lambda: run(
+            ListFingerPrints('bench-list', size, False), lines))
+        report("list window", plain, count)
+        report("ring & set window", ring, count, plain)
+        if size == 100:
+            # Saving every unique line dominates, time fewer of them
+            saved = best_of(lambda: run(ListFingerPrints('bench-list', size),
+                lines[:count//10]), repeat=1)*10
+            report("list window, saving each line", saved, count)
+            report("ring & set window", ring, count, saved)
+        print()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Micro-benchmark of GameCog.read, which parses a drained block of log lines with
+filter_batch and routes only the events, against the former per-line routing
+through filter. Runs a Minecraft server over a synthetic log block, most lines
+being noise from other threads or levels, as real logs are.
+
+    python bench/bench_routing.py [lines]
+
+Authors: Emmett Peck (EmmettPeck)
+Version: October 18th, 2026
+"""
+
+import random
+import sys
+import time
+
+from harness import report
+
+from cogs.minecraft import Minecraft
+from log_sources import nanos_to_datetime
+from server import Server
+
+VERSION = "Minecraft:1.19"
+
+# Share of lines of each kind in the block
+LINES = (
+    (0.40, "[12:34:56] [Worker-Main-{i}/INFO]: Preparing spawn area: {i}%"),
+    (0.15, "[12:34:56] [Server thread/WARN]: Can't keep up! Running {i}ms behind"),
+    (0.15, "[12:34:56] [Server thread/INFO]: Saved the game {i}"),
+    (0.20, "[12:34:56] [Server thread/INFO]: <Steve> message {i}"),
+    (0.04, "[12:34:56] [Server thread/INFO]: Steve{i} joined the game"),
+    (0.04, "[12:34:56] [Server thread/INFO]: Steve{i} left the game"),
+    (0.02, "[12:34:56] [Server thread/INFO]: Steve was slain by Zombie {i}"),
+)
+
+
+class BlockSource:
+    """Log source stand-in, drained of one block of lines"""
+
+    def __init__(self, lines:list):
+        self.lines = lines
+
+    def drain(self) -> list:
+        lines, self.lines = self.lines, []
+        return lines
+
+    def commit(self, nanos:int, position):
+        pass
+
+def make_lines(count:int) -> list:
+    """Returns: count `(nanos, position, line)` tuples of a mixed log"""
+    rng = random.Random(0)
+    weights, layouts = zip(*LINES)
+    start = time.time_ns()
+    return [(start + i, None, rng.choices(layouts, weights)[0].format(i=i))
+        for i in range(count)]
+
+def make_server(name:str, lines:list) -> Server:
+    server = Server(bot=None, statistics=[], cog_name='Minecraft',
+        server={'name': name, 'docker_name': name, 'version': VERSION})
+    server.log_source = BlockSource(list(lines))
+    return server
+
+def read_per_line(cog:Minecraft, server:Server) -> int:
+    """The former read(); every line through filter()"""
+    lines = server.log_source.drain()
+    for nanos, position, msg in lines:
+        cog.filter(message=msg, server=server, ignore=False,
+            timestamp=nanos_to_datetime(nanos))
+    return len(lines)
+
+def best_read(read, cog:Minecraft, lines:list, repeat:int=5) -> float:
+    """Returns: fastest seconds of read over lines, on a fresh server each run"""
+    times = []
+    for i in range(repeat):
+        server = make_server(f"bench_{read.__name__}_{i}", lines)
+        start = time.perf_counter()
+        read(cog, server)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    lines = make_lines(count)
+    cog = Minecraft(None)
+
+    per_line = make_server('bench_check_line', lines)
+    batch = make_server('bench_check_batch', lines)
+    read_per_line(cog, per_line)
+    Minecraft.read(cog, batch)
+    assert per_line.connect_queue.qsize() == batch.connect_queue.qsize()
+
+    print(f"{VERSION}, {count} lines")
+    before = best_read(read_per_line, cog, lines)
+    after = best_read(Minecraft.read, cog, lines)
+    report("per-line filter", before, count)
+    report("batch filter_batch", after, count, before)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,31 @@
+"""
+Benchmark harness; like app/conftest.py, runs from app/ of a temporary tree
+holding empty settings, as DB loads ../data relative to the working directory
+on import. Import before any app module.
+
+Authors: Emmett Peck (EmmettPeck)
+Version: October 18th, 2026
+"""
+
+import os
+import sys
+import timeit
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'app')
+sys.path.insert(0, APP)
+
+from data_tree import enter_data_tree
+
+ROOT = enter_data_tree('pinebot-bench-')
+os.makedirs(os.path.join(ROOT, 'app', 'data', 'hashes'))
+
+def best_of(func, repeat:int=5) -> float:
+    """Returns: fastest seconds of repeat calls of func"""
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+def report(name:str, seconds:float, lines:int, baseline:float=None):
+    """Prints seconds & per line cost of a run, and speedup over baseline"""
+    speedup = f"  {baseline/seconds:6.1f}x" if baseline else ""
+    print(f"{name:<34}{seconds*1000:9.2f} ms {seconds/lines*10**6:8.2f} us/line"
+        + speedup)